@@ -1,48 +1,341 @@
 """
 Web Crawler için ayarlar ve yapılandırma parametreleri
 """
+import json
+import logging
 import os
-from dotenv import load_dotenv
+import sys
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from typing import FrozenSet, Mapping, Optional, Pattern, Tuple
 
-# .env dosyasını yükle (varsa)
-load_dotenv()
+# .env dosyasını yükle (varsa). Dosya yoksa dotenv paketi hiç içe aktarılmaz;
+# ortam değişkenleri dışarıdan verildiğinde SKIP_DOTENV=1 ile tamamen atlanabilir.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.getenv("SKIP_DOTENV") != "1":
+    _dotenv_path = next(
+        (path for path in (".env", os.path.join(_PROJECT_ROOT, ".env")) if os.path.exists(path)),
+        None
+    )
+    if _dotenv_path:
+        from dotenv import load_dotenv
+        load_dotenv(_dotenv_path)
 
-# Veri tabanı ayarları
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///crawler_data.db")
 
-# Crawler ayarları
-MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
-REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
-RATE_LIMIT = float(os.getenv("RATE_LIMIT", "0.01"))  # Saniye başına istek sayısı
-MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
-BACKOFF_FACTOR = float(os.getenv("BACKOFF_FACTOR", "0.5"))
-VERIFY_SSL = os.getenv("VERIFY_SSL", "True").lower() == "true"
+def _as_str(env: Mapping[str, str], key: str, default: str) -> str:
+    """Ortam değişkenini metin olarak oku"""
+    return env.get(key, default)
 
-# Proxy ayarları
-USE_PROXIES = os.getenv("USE_PROXIES", "False").lower() == "true"
-PROXIES = os.getenv("PROXIES", "").split(",") if os.getenv("PROXIES") else []
-PROXY_ROTATION_LIMIT = int(os.getenv("PROXY_ROTATION_LIMIT", "50"))
 
-# Crawler davranış ayarları
-MAX_PAGES = int(os.getenv("MAX_PAGES", "0")) or None  # 0 ise tüm sayfalar
-MAX_DEPTH = int(os.getenv("MAX_DEPTH", "0")) or None  # 0 ise sınırsız derinlik
-IMPORTANT_URL_PARAMS = set(os.getenv("IMPORTANT_URL_PARAMS", "id,page,category").split(","))
+def _as_int(env: Mapping[str, str], key: str, default: str) -> int:
+    """Ortam değişkenini tam sayıya çevir"""
+    value = env.get(key, default)
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{key} bir tam sayı olmalı, alınan değer: {value!r}") from None
 
-# Bellek yönetimi
-BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))  # Veritabanına toplu yazma için
+
+def _as_float(env: Mapping[str, str], key: str, default: str) -> float:
+    """Ortam değişkenini ondalıklı sayıya çevir"""
+    value = env.get(key, default)
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{key} bir sayı olmalı, alınan değer: {value!r}") from None
+
+
+def _as_bool(env: Mapping[str, str], key: str, default: str) -> bool:
+    """Ortam değişkenini mantıksal değere çevir ("true" ise True)"""
+    return env.get(key, default).lower() == "true"
+
+
+# Virgülle ayrılmış listelerden boşlukları tek geçişte silmek için çeviri tablosu
+_CSV_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+def _split_csv_env(env: Mapping[str, str], key: str, default: str) -> Tuple[str, ...]:
+    """Virgülle ayrılmış ortam değişkenini boşluksuz, boş öğeleri atılmış demete çevir"""
+    return tuple(filter(None, env.get(key, default).translate(_CSV_WHITESPACE).split(",")))
+
+
+def _compile_url_pattern(pattern: Optional[str]) -> Optional[Pattern[str]]:
+    """
+    URL filtre desenini derle; google-re2 kuruluysa geri izlemesiz (DFA) motoru kullan
+    
+    Args:
+        pattern: Düzenli ifade ya da None
+    
+    Returns:
+        Optional[Pattern]: Derlenmiş desen, desen verilmemişse None
+    """
+    if not pattern:
+        return None
+    try:
+        import re2 as regex_engine
+    except ImportError:
+        import re as regex_engine
+    return regex_engine.compile(pattern)
+
+
+def _as_log_level(env: Mapping[str, str], key: str, default: str) -> int:
+    """Log seviyesi adını (INFO, DEBUG, vb.) sayısal değere çevir, bilinmiyorsa INFO"""
+    level = logging.getLevelName(env.get(key, default).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """İçe aktarma sırasında bir kez okunan, değiştirilemez ayarlar"""
+
+    # Veri tabanı ayarları
+    DATABASE_URL: str
+
+    # Crawler ayarları
+    MAX_CONCURRENT_REQUESTS: int
+    REQUEST_TIMEOUT: int
+    RATE_LIMIT: float  # Saniye başına istek sayısı
+    MAX_RETRIES: int
+    BACKOFF_FACTOR: float
+    VERIFY_SSL: bool
+    USE_UVLOOP: bool  # uvloop kuruluysa olay döngüsü olarak kullan
+    ASYNCIO_DEBUG: bool  # asyncio hata ayıklama modu (her await'e ek yük bindirir)
+    STRICT_FAST_PARSER: bool  # aiohttp C ayrıştırıcısı yoksa uyarmak yerine hata ver
+    HTML_PARSER: str  # BeautifulSoup ayrıştırıcısı (varsayılan: C tabanlı lxml; html.parser, ...) ya da selectolax için "lexbor"
+    EXTRACT_WORKERS: int  # HTML içerik çıkarma süreç havuzunun boyutu (0: CPU sayısı)
+
+    # Bağlantı havuzu ve DNS önbelleği
+    DNS_CACHE_TTL: int  # DNS sonuçlarının önbellekte tutulma süresi (saniye)
+    KEEPALIVE_CONNECTIONS: int  # Havuzda tutulabilecek toplam bağlantı sayısı
+    KEEPALIVE_EXPIRY: int  # Boştaki bağlantının kapatılmadan önce bekleme süresi (saniye)
+    LIMIT_PER_HOST: int  # Tek bir sunucuya açılabilecek eşzamanlı bağlantı sayısı (0: sınırsız)
+    MAX_TASKS_PER_MINUTE: int  # Alan adı başına dakikalık istek bütçesi (0: sınırsız)
+
+    # Proxy ayarları
+    USE_PROXIES: bool
+    PROXIES: Tuple[str, ...]
+    PROXY_ROTATION_LIMIT: int
+
+    # Crawler davranış ayarları
+    MAX_PAGES: int  # sys.maxsize ise tüm sayfalar
+    MAX_DEPTH: int  # sys.maxsize ise sınırsız derinlik
+    IMPORTANT_URL_PARAMS: FrozenSet[str]
+    URL_INCLUDE_PATTERN: Optional[str]  # Yalnızca eşleşen URL'ler taranır (None ise hepsi)
+    URL_EXCLUDE_PATTERN: Optional[str]  # Eşleşen URL'ler taranmaz (None ise hiçbiri)
+    SKIP_NEAR_DUPLICATES: bool  # İçeriği daha önce kaydedilmiş bir sayfaya çok benzeyen HTML sayfaları kaydedilmez
+    NEAR_DUPLICATE_DISTANCE: int  # Kopya sayılacak en büyük SimHash Hamming uzaklığı (64 bit üzerinden)
+
+    # Bellek yönetimi
+    SEEN_SET_BITS: int  # >0 ise ziyaret edilen URL'ler 2**SEEN_SET_BITS bitlik kümede tutulur (0: tam küme)
+    USE_BLOOM_FILTER: bool  # Ziyaret edilen URL'ler için ölçeklenebilir Bloom filtresi kullan
+    BLOOM_INITIAL_CAPACITY: int
+    BLOOM_ERROR_RATE: float
+    BLOOM_RECENT_SIZE: int  # Bloom filtresinin önünde tam olarak tutulan son URL sayısı
+    BATCH_SIZE: int  # Veritabanına toplu yazma için (bir işlemde yazılan satır sayısı)
+    PAGE_BATCH_SIZE: int  # Bu kadar sayfa biriktiğinde veritabanına tek işlemde yazılır
+    FLUSH_INTERVAL: float  # Biriken sayfaların en geç yazılma aralığı (saniye)
+    PDF_SPOOL_MAX_SIZE: int  # Bu boyutu aşan PDF'ler bellekte değil geçici dosyada tutulur (bayt)
+    MAX_HTML_SIZE: int  # Bu boyutu aşan HTML yanıtları okunmadan bırakılır (bayt, 0: sınırsız)
+    FRONTIER_MEMORY_LIMIT: int  # Bellekte bekleyen en fazla URL; fazlası geçici dosyaya taşar (0: sınırsız)
+
+    # Logging
+    LOG_LEVEL: int  # logging.INFO, logging.DEBUG, vb.
+    LOG_DEBUG_ENABLED: bool  # Sıcak yoldaki debug loglarını kayıt oluşturmadan atlamak için
+    LOG_FILE: str
+
+    def to_json(self) -> str:
+        """
+        Ayarları JSON metnine çevir (alt süreçlere ortamı yeniden okutmadan aktarmak için)
+        
+        Returns:
+            str: JSON metni
+        """
+        data = asdict(self)
+        data["IMPORTANT_URL_PARAMS"] = sorted(self.IMPORTANT_URL_PARAMS)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "Settings":
+        """
+        to_json ile üretilmiş metinden Settings nesnesini yeniden oluştur
+        
+        Args:
+            payload: JSON metni
+        
+        Returns:
+            Settings: Ayarlar nesnesi
+        """
+        data = json.loads(payload)
+        data["PROXIES"] = tuple(data["PROXIES"])
+        data["IMPORTANT_URL_PARAMS"] = frozenset(map(sys.intern, data["IMPORTANT_URL_PARAMS"]))
+        return cls(**data)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Ortam değişkenlerini tek seferde okuyup Settings nesnesini oluştur
+
+    Returns:
+        Settings: Önbelleğe alınmış ayarlar
+    """
+    # os.environ'un tek bir anlık görüntüsü üzerinden çalış
+    env = dict(os.environ)
+    log_level = _as_log_level(env, "LOG_LEVEL", "INFO")
+
+    return Settings(
+        DATABASE_URL=_as_str(env, "DATABASE_URL", "sqlite:///crawler_data.db"),
+        MAX_CONCURRENT_REQUESTS=_as_int(env, "MAX_CONCURRENT_REQUESTS", "10"),
+        REQUEST_TIMEOUT=_as_int(env, "REQUEST_TIMEOUT", "30"),
+        RATE_LIMIT=_as_float(env, "RATE_LIMIT", "0.01"),
+        MAX_RETRIES=_as_int(env, "MAX_RETRIES", "3"),
+        BACKOFF_FACTOR=_as_float(env, "BACKOFF_FACTOR", "0.5"),
+        VERIFY_SSL=_as_bool(env, "VERIFY_SSL", "True"),
+        USE_UVLOOP=_as_bool(env, "USE_UVLOOP", "True"),
+        ASYNCIO_DEBUG=_as_bool(env, "ASYNCIO_DEBUG", "False"),
+        STRICT_FAST_PARSER=_as_bool(env, "STRICT_FAST_PARSER", "False"),
+        HTML_PARSER=_as_str(env, "HTML_PARSER", "lxml"),
+        EXTRACT_WORKERS=_as_int(env, "EXTRACT_WORKERS", "0"),
+        DNS_CACHE_TTL=_as_int(env, "DNS_CACHE_TTL", "300"),
+        KEEPALIVE_CONNECTIONS=_as_int(env, "KEEPALIVE_CONNECTIONS", "100"),
+        KEEPALIVE_EXPIRY=_as_int(env, "KEEPALIVE_EXPIRY", "60"),
+        LIMIT_PER_HOST=_as_int(env, "LIMIT_PER_HOST", "8"),
+        MAX_TASKS_PER_MINUTE=_as_int(env, "MAX_TASKS_PER_MINUTE", "0"),
+        USE_PROXIES=_as_bool(env, "USE_PROXIES", "False"),
+        PROXIES=_split_csv_env(env, "PROXIES", ""),
+        PROXY_ROTATION_LIMIT=_as_int(env, "PROXY_ROTATION_LIMIT", "50"),
+        MAX_PAGES=_as_int(env, "MAX_PAGES", "0") or sys.maxsize,  # 0 ise tüm sayfalar
+        MAX_DEPTH=_as_int(env, "MAX_DEPTH", "0") or sys.maxsize,  # 0 ise sınırsız derinlik
+        IMPORTANT_URL_PARAMS=frozenset(
+            map(sys.intern, _split_csv_env(env, "IMPORTANT_URL_PARAMS", "id,page,category"))
+        ),
+        URL_INCLUDE_PATTERN=env.get("URL_INCLUDE_PATTERN") or None,
+        URL_EXCLUDE_PATTERN=env.get("URL_EXCLUDE_PATTERN") or None,
+        SKIP_NEAR_DUPLICATES=_as_bool(env, "SKIP_NEAR_DUPLICATES", "False"),
+        NEAR_DUPLICATE_DISTANCE=_as_int(env, "NEAR_DUPLICATE_DISTANCE", "3"),
+        SEEN_SET_BITS=_as_int(env, "SEEN_SET_BITS", "0"),
+        USE_BLOOM_FILTER=_as_bool(env, "USE_BLOOM_FILTER", "False"),
+        BLOOM_INITIAL_CAPACITY=_as_int(env, "BLOOM_INITIAL_CAPACITY", "1000000"),
+        BLOOM_ERROR_RATE=_as_float(env, "BLOOM_ERROR_RATE", "1e-7"),
+        BLOOM_RECENT_SIZE=_as_int(env, "BLOOM_RECENT_SIZE", "50000"),
+        BATCH_SIZE=_as_int(env, "BATCH_SIZE", "500"),
+        PAGE_BATCH_SIZE=_as_int(env, "PAGE_BATCH_SIZE", "50"),
+        FLUSH_INTERVAL=_as_float(env, "FLUSH_INTERVAL", "0.5"),
+        PDF_SPOOL_MAX_SIZE=_as_int(env, "PDF_SPOOL_MAX_SIZE", str(4 * 1024 * 1024)),
+        MAX_HTML_SIZE=_as_int(env, "MAX_HTML_SIZE", str(20 * 1024 * 1024)),
+        FRONTIER_MEMORY_LIMIT=_as_int(env, "FRONTIER_MEMORY_LIMIT", "100000"),
+        LOG_LEVEL=log_level,
+        LOG_DEBUG_ENABLED=log_level <= logging.DEBUG,
+        LOG_FILE=_as_str(env, "LOG_FILE", "crawler.log"),
+    )
+
+
+# Birlikte ayarlanması gereken ayarlar (tek ayar düğmesi: kullanılabilir bellek)
+#
+# - MAX_CONCURRENT_REQUESTS: Uçuştaki her istek yanıt gövdesi ve ayrıştırılmış DOM için
+#   yaklaşık MEMORY_PER_REQUEST_MB bellek tutar; eşzamanlılık bu bütçeyle sınırlanır.
+# - BATCH_SIZE: Veritabanı yazıcısının üreticilerin gerisinde kalmaması için en az
+#   eşzamanlılığın 5 katı olmalıdır; aksi halde kuyruklar tarama süresiyle büyür.
+# - PROXY_ROTATION_LIMIT: Uçuştaki isteklerin farklı proxy'lere dağılabilmesi için
+#   en az proxy sayısı ve eşzamanlılığın yarısı kadar olmalıdır.
+MEMORY_PER_REQUEST_MB = 2
+
+
+def _available_memory_mb() -> int:
+    """Kullanılabilir fiziksel belleği MB olarak döndür (ölçülemiyorsa 0)"""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def tune(max_mem_mb: int = None, base: Settings = None) -> Settings:
+    """
+    Eşzamanlılık, toplu yazma boyutu ve proxy rotasyonunu bellek bütçesine göre birlikte ayarla
+    
+    Args:
+        max_mem_mb: Crawler'a ayrılan bellek (MB); verilmezse kullanılabilir bellek ölçülür
+        base: Başlangıç ayarları (varsayılan: get_settings())
+    
+    Returns:
+        Settings: Ayarlanmış yeni Settings nesnesi (base değiştirilmez)
+    """
+    base = base or get_settings()
+    max_mem_mb = max_mem_mb or _available_memory_mb()
+    
+    concurrency = base.MAX_CONCURRENT_REQUESTS
+    if max_mem_mb:
+        concurrency = max(1, min(concurrency, max_mem_mb // MEMORY_PER_REQUEST_MB))
+    
+    return replace(
+        base,
+        MAX_CONCURRENT_REQUESTS=concurrency,
+        BATCH_SIZE=max(base.BATCH_SIZE, concurrency * 5),
+        PROXY_ROTATION_LIMIT=max(base.PROXY_ROTATION_LIMIT, len(base.PROXIES), concurrency // 2),
+    )
+
+
+settings = get_settings()
+
+# Modül seviyesindeki sabitler (mevcut `from config.settings import X` kullanımları için)
+DATABASE_URL = settings.DATABASE_URL
+
+MAX_CONCURRENT_REQUESTS = settings.MAX_CONCURRENT_REQUESTS
+REQUEST_TIMEOUT = settings.REQUEST_TIMEOUT
+RATE_LIMIT = settings.RATE_LIMIT
+MAX_RETRIES = settings.MAX_RETRIES
+BACKOFF_FACTOR = settings.BACKOFF_FACTOR
+VERIFY_SSL = settings.VERIFY_SSL
+USE_UVLOOP = settings.USE_UVLOOP
+ASYNCIO_DEBUG = settings.ASYNCIO_DEBUG
+STRICT_FAST_PARSER = settings.STRICT_FAST_PARSER
+HTML_PARSER = settings.HTML_PARSER
+EXTRACT_WORKERS = settings.EXTRACT_WORKERS
+
+DNS_CACHE_TTL = settings.DNS_CACHE_TTL
+KEEPALIVE_CONNECTIONS = settings.KEEPALIVE_CONNECTIONS
+KEEPALIVE_EXPIRY = settings.KEEPALIVE_EXPIRY
+LIMIT_PER_HOST = settings.LIMIT_PER_HOST
+MAX_TASKS_PER_MINUTE = settings.MAX_TASKS_PER_MINUTE
+
+USE_PROXIES = settings.USE_PROXIES
+PROXIES = settings.PROXIES
+PROXY_ROTATION_LIMIT = settings.PROXY_ROTATION_LIMIT
+
+MAX_PAGES = settings.MAX_PAGES
+MAX_DEPTH = settings.MAX_DEPTH
+IMPORTANT_URL_PARAMS = settings.IMPORTANT_URL_PARAMS
+SKIP_NEAR_DUPLICATES = settings.SKIP_NEAR_DUPLICATES
+NEAR_DUPLICATE_DISTANCE = settings.NEAR_DUPLICATE_DISTANCE
+
+# URL filtreleri içe aktarmada bir kez derlenir
+URL_INCLUDE_RE = _compile_url_pattern(settings.URL_INCLUDE_PATTERN)
+URL_EXCLUDE_RE = _compile_url_pattern(settings.URL_EXCLUDE_PATTERN)
+
+SEEN_SET_BITS = settings.SEEN_SET_BITS
+USE_BLOOM_FILTER = settings.USE_BLOOM_FILTER
+BLOOM_INITIAL_CAPACITY = settings.BLOOM_INITIAL_CAPACITY
+BLOOM_ERROR_RATE = settings.BLOOM_ERROR_RATE
+BLOOM_RECENT_SIZE = settings.BLOOM_RECENT_SIZE
+BATCH_SIZE = settings.BATCH_SIZE
+PAGE_BATCH_SIZE = settings.PAGE_BATCH_SIZE
+FLUSH_INTERVAL = settings.FLUSH_INTERVAL
+PDF_SPOOL_MAX_SIZE = settings.PDF_SPOOL_MAX_SIZE
+MAX_HTML_SIZE = settings.MAX_HTML_SIZE
+FRONTIER_MEMORY_LIMIT = settings.FRONTIER_MEMORY_LIMIT
 
 # İçerik seçiciler
-MAIN_CONTENT_SELECTOR = "section.pages-content"  # Ana içerik için
-HOSPITAL_INFO_SELECTOR = "#header-middle-content"  # Hastane bilgisi için
+MAIN_CONTENT_SELECTOR = sys.intern("section.pages-content")  # Ana içerik için
+HOSPITAL_INFO_SELECTOR = sys.intern("#header-middle-content")  # Hastane bilgisi için
 
-# Logging
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "crawler.log")
+LOG_LEVEL = settings.LOG_LEVEL
+LOG_DEBUG_ENABLED = settings.LOG_DEBUG_ENABLED
+LOG_FILE = settings.LOG_FILE
 
-# User Agent 
-USER_AGENTS = [
+# User Agent
+USER_AGENTS = (
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
     'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1',
     'Mozilla/5.0 (Linux; Android 10; SM-G973F) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Mobile Safari/537.36',
-]
\ No newline at end of file
+)
@@ -1,8 +1,29 @@
 """
 Crawler modülleri
+
+Alt modüller (aiohttp, bs4, SQLAlchemy vb.) ilk erişimde yüklenir (PEP 562).
 """
-from crawler.crawler import WebCrawler
-from crawler.url_manager import URLManager
-from crawler.rate_limiter import RateLimiter
+import importlib
+
+__all__ = ['WebCrawler', 'URLManager', 'RateLimiter', 'Frontier']
+
+# Dışa açılan isim -> tanımlandığı modül
+_LAZY_ATTRS = {
+    'WebCrawler': 'crawler.crawler',
+    'URLManager': 'crawler.url_manager',
+    'RateLimiter': 'crawler.rate_limiter',
+    'Frontier': 'crawler.frontier',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['WebCrawler', 'URLManager', 'RateLimiter']
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -2,21 +2,34 @@
 Ana web crawler sınıfı
 """
 import asyncio
+import gzip
+import io
+import itertools
 import logging
+import os
+import re
+import sys
+import tempfile
 import time
-import traceback
-from typing import Dict, List, Set, Any, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Set, Any, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import aiohttp
-from aiohttp import ClientSession, TCPConnector, ClientTimeout
-import xml.etree.ElementTree as ET
+from aiohttp import ClientSession, TCPConnector, ClientTimeout, http_parser
 from bs4 import BeautifulSoup
+from lxml import etree
 
 from config.settings import (
     MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT, MAX_RETRIES, 
-    BACKOFF_FACTOR, VERIFY_SSL, USE_PROXIES, BATCH_SIZE
+    BACKOFF_FACTOR, VERIFY_SSL, USE_PROXIES, BATCH_SIZE, PAGE_BATCH_SIZE, FLUSH_INTERVAL,
+    DNS_CACHE_TTL, KEEPALIVE_CONNECTIONS, KEEPALIVE_EXPIRY, LOG_DEBUG_ENABLED,
+    STRICT_FAST_PARSER, LIMIT_PER_HOST, MAX_TASKS_PER_MINUTE, PDF_SPOOL_MAX_SIZE, MAX_HTML_SIZE,
+    EXTRACT_WORKERS, SKIP_NEAR_DUPLICATES, NEAR_DUPLICATE_DISTANCE, FRONTIER_MEMORY_LIMIT
 )
+from crawler.frontier import Frontier
 from crawler.url_manager import URLManager
 from crawler.rate_limiter import RateLimiter
 from database.db_manager import DatabaseManager
@@ -25,9 +38,91 @@ from scraper.pdf_extractor import PDFExtractor
 from utils.proxy_manager import ProxyManager
 from utils.user_agents import UserAgentManager
 from utils.logger import LoggingTimer, setup_logger
+from utils.simhash import NearDuplicateIndex, simhash
 
 logger = setup_logger(__name__)
 
+# /sitemap.xml bulunamazsa denenecek alternatif sitemap yolları
+_ALT_SITEMAP_LOCS = ('/sitemap_index.xml', '/sitemap.php', '/sitemap_index.xml.gz', '/sitemap.xml.gz')
+
+# Yönlendirmelerde aynı (url, Location) çiftleri tekrar tekrar birleştirilmesin
+_cached_urljoin = lru_cache(maxsize=4096)(urljoin)
+
+# XML olarak ayrıştırılamayan sitemap'ler için <loc> deseni (ham bayt üzerinde çalışır)
+_LOC_RE = re.compile(rb'<loc[^>]*>(.*?)</loc>', re.IGNORECASE | re.DOTALL)
+
+# Bu boyutu aşan sıkıştırılmış sitemap'ler olay döngüsü dışında açılır
+_GZIP_INLINE_MAX = 256 * 1024
+
+# Yönlendirme ve engelleme (proxy değiştirilip tekrar denenir) durum kodları
+_REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+_BLOCKED_STATUSES = frozenset((403, 429))
+
+# İçerik türü önekleri (Content-Type küçük harfe çevrilmiş ve parametreleri ile karşılaştırılır)
+_PDF_CONTENT_TYPES = ('application/pdf',)
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+def _check_http_parser() -> None:
+    """
+    aiohttp'nin C (llhttp) HTTP ayrıştırıcısıyla çalıştığını doğrula
+    
+    C eklentisi derlenemediğinde aiohttp sessizce saf Python ayrıştırıcısına döner;
+    bu durumda yanıt ayrıştırma belirgin şekilde yavaşlar.
+    """
+    if http_parser.HttpResponseParser is http_parser.HttpResponseParserPy:
+        message = "aiohttp C eklentileri bulunamadı, saf Python HTTP ayrıştırıcısı kullanılıyor"
+        if STRICT_FAST_PARSER:
+            raise RuntimeError(message)
+        logger.warning(message)
+
+# Alt süreçte bir kez oluşturulan HTML ve PDF çıkarıcıları
+_worker_html_extractor: Optional[HTMLExtractor] = None
+_worker_pdf_extractor: Optional[PDFExtractor] = None
+
+
+def _extract_html_worker(html: bytes, url: str, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    HTML içeriğini alt süreçte çıkar (ProcessPoolExecutor için modül seviyesinde)
+    
+    Args:
+        html: Ham HTML içeriği
+        url: Sayfanın URL'si
+        encoding: Content-Type başlığındaki karakter kodlaması (yoksa belgeden tespit edilir)
+    
+    Returns:
+        Dict[str, Any]: Çıkarılan içerik
+    """
+    global _worker_html_extractor
+    if _worker_html_extractor is None:
+        _worker_html_extractor = HTMLExtractor()
+    content = _worker_html_extractor.extract_content(html, url, encoding)
+    
+    # Yakın kopya tespiti için parmak izi de alt süreçte hesaplanır
+    if SKIP_NEAR_DUPLICATES:
+        content['simhash'] = simhash(content.get('main_content') or content.get('full_text') or '')
+    return content
+
+
+def _extract_pdf_worker(source: Union[bytes, str], url: str) -> Dict[str, Any]:
+    """
+    PDF metnini alt süreçte çıkar (PyMuPDF olay döngüsünü bloklamaz)
+    
+    Args:
+        source: PDF içeriği (bytes) ya da geçici dosyanın yolu (str)
+        url: PDF'nin URL'si
+    
+    Returns:
+        Dict[str, Any]: Çıkarılan içerik
+    """
+    global _worker_pdf_extractor
+    if _worker_pdf_extractor is None:
+        _worker_pdf_extractor = PDFExtractor()
+    if isinstance(source, str):
+        return _worker_pdf_extractor.extract_text_file_sync(source, url)
+    return _worker_pdf_extractor.extract_text_sync(source, url)
+
+
 class WebCrawler:
     """Web sayfalarını taramak için ana sınıf"""
     
@@ -48,8 +143,8 @@ class WebCrawler:
         Args:
             base_url: Tarama başlangıç URL'si
             db_manager: Veritabanı yöneticisi
-            max_pages: Maksimum taranacak sayfa sayısı (None: sınırsız)
-            max_depth: Maksimum tarama derinliği (None: sınırsız)
+            max_pages: Maksimum taranacak sayfa sayısı (None veya 0: sınırsız)
+            max_depth: Maksimum tarama derinliği (None veya 0: sınırsız)
             concurrency: Eşzamanlı istek sayısı
             timeout: İstek zaman aşımı (saniye)
             verify_ssl: SSL sertifikası doğrulama
@@ -57,8 +152,9 @@ class WebCrawler:
         """
         self.base_url = base_url
         self.db_manager = db_manager
-        self.max_pages = max_pages
-        self.max_depth = max_depth
+        # Sınırsız durum sys.maxsize ile ifade edilir; döngüde None kontrolü gerekmez
+        self.max_pages = max_pages or sys.maxsize
+        self.max_depth = max_depth or sys.maxsize
         self.concurrency = concurrency
         self.timeout = timeout
         self.verify_ssl = verify_ssl
@@ -66,16 +162,27 @@ class WebCrawler:
         
         # Yardımcı sınıfları başlat
         self.url_manager = URLManager(base_url)
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = RateLimiter(tasks_per_minute=MAX_TASKS_PER_MINUTE)
         self.proxy_manager = ProxyManager() if use_proxies else None
         self.user_agent_manager = UserAgentManager()
         
-        # İçerik çıkarıcıları başlat
-        self.html_extractor = HTMLExtractor()
-        self.pdf_extractor = PDFExtractor()
+        # Sitemap adresleri bir kez hesaplanır
+        self._sitemap_url = urljoin(base_url, '/sitemap.xml')
+        self._alt_sitemap_urls = tuple(urljoin(base_url, loc) for loc in _ALT_SITEMAP_LOCS)
+        
+        # Her User-Agent için bir kez hazırlanan, sırayla kullanılan header sözlükleri
+        self._header_pool = tuple(
+            self.user_agent_manager.get_headers(referer=base_url)
+            for _ in self.user_agent_manager.user_agents
+        )
+        self._next_headers = itertools.cycle(self._header_pool).__next__
+        
+        # Kaydedilen HTML sayfalarının SimHash parmak izleri (SKIP_NEAR_DUPLICATES kapalıysa None)
+        self.near_duplicates = NearDuplicateIndex(NEAR_DUPLICATE_DISTANCE) if SKIP_NEAR_DUPLICATES else None
         
         # Durum takibi
         self.crawled_count = 0
+        # time.monotonic() değerleri; yalnızca süre hesabında kullanılır (zaman damgaları veritabanında)
         self.start_time = None
         self.end_time = None
         self.current_session_id = None
@@ -87,16 +194,51 @@ class WebCrawler:
             'total_urls': 0,
             'successful': 0,
             'failed': 0,
-            'http_errors': {},
-            'content_types': {},
-            'avg_response_time': 0,
-            'total_response_time': 0
+            'near_duplicates': 0,
+            'http_errors': Counter(),
+            'content_types': Counter()
         }
+        # Ortalama yanıt süresi okunurken hesaplanır (her istekte bölme yapılmaz)
+        self.total_response_time = 0.0
+        
+        # Kuyruk yönetimi (eşzamanlılık işçi sayısıyla sınırlıdır)
+        self.frontier = Frontier(FRONTIER_MEMORY_LIMIT)  # Kapatıldığında (tarama bitti/durduruldu) bekleyen işçiler uyanır
+        self._busy = 0  # O anda URL işleyen işçi sayısı
         
-        # Görev ve kuyruk yönetimi
-        self.active_tasks = set()
-        self.url_queue = asyncio.Queue()
-        self.semaphore = asyncio.Semaphore(concurrency)
+        # Veritabanına toplu yazılmayı bekleyen (sayfa verisi, bağlantılar) ikilileri
+        self._page_buffer: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]] = []
+        self._flush_lock = asyncio.Lock()
+        
+        # HTML ve PDF ayrıştırma (CPU yoğun) olay döngüsünü bloklamaması için ayrı süreçlerde yapılır
+        self._html_pool: Optional[ProcessPoolExecutor] = None
+        
+        # HTTP oturumu ilk start() çağrısında oluşturulur, close() ile kapatılır
+        self._session: Optional[ClientSession] = None
+    
+    def _get_session(self) -> ClientSession:
+        """
+        Paylaşılan HTTP oturumunu döndür, yoksa oluştur
+        
+        Returns:
+            ClientSession: Bağlantıları ve DNS sonuçlarını yeniden kullanan oturum
+        """
+        if self._session is None or self._session.closed:
+            conn = TCPConnector(
+                limit=max(self.concurrency, KEEPALIVE_CONNECTIONS),
+                limit_per_host=LIMIT_PER_HOST,
+                ssl=self.verify_ssl,
+                use_dns_cache=True,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_EXPIRY
+            )
+            self._session = ClientSession(connector=conn, timeout=ClientTimeout(total=self.timeout))
+        return self._session
+    
+    async def close(self) -> None:
+        """HTTP oturumunu ve bağlantı havuzunu kapat (duraklatmada değil, kapanışta çağrılır)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def start(self) -> None:
         """Crawler'ı başlat"""
@@ -104,18 +246,21 @@ class WebCrawler:
             logger.warning("Crawler zaten çalışıyor")
             return
         
+        _check_http_parser()
+        
         self.is_running = True
         self.is_paused = False
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
         # Veritabanını başlat
         await self.db_manager.init_db()
         
         # Yeni bir tarama oturumu başlat
+        # sys.maxsize yalnızca karşılaştırmalar için; oturum kaydında sınırsız değer None olarak saklanır
         config = {
             'base_url': self.base_url,
-            'max_pages': self.max_pages,
-            'max_depth': self.max_depth,
+            'max_pages': None if self.max_pages == sys.maxsize else self.max_pages,
+            'max_depth': None if self.max_depth == sys.maxsize else self.max_depth,
             'concurrency': self.concurrency,
             'timeout': self.timeout,
             'verify_ssl': self.verify_ssl,
@@ -124,40 +269,65 @@ class WebCrawler:
         self.current_session_id = await self.db_manager.start_crawl_session(self.base_url, config)
         
         # Başlangıç URL'sini kuyruğa ekle
-        await self.url_queue.put((self.base_url, 0))  # (url, depth)
-        self.stats['total_urls'] += 1
+        if self.url_manager.mark_as_enqueued_if_absent(self.base_url):
+            self.frontier.push(self.base_url, 0)
+            self.stats['total_urls'] += 1
         
         logger.info(f"Crawling başlatıldı: {self.base_url}")
         
+        # Uzun ömürlü HTTP oturumunu al (resume() sonrası aynı bağlantı havuzu kullanılır)
+        session = self._get_session()
+        
+        # Sitemap'i çek (varsa)
         try:
-            # HTTP oturumunu oluştur
-            conn = TCPConnector(
-                limit=self.concurrency,
-                ssl=None if not self.verify_ssl else True,
-                force_close=True
-            )
-            timeout = ClientTimeout(total=self.timeout)
+            sitemap_urls = await self.fetch_sitemap(session)
+            # Sitemap URL'lerini kuyruğa ekle
+            for url in sitemap_urls:
+                if not self.url_manager.mark_as_enqueued_if_absent(url):
+                    continue
+                self.frontier.push(url, 0)
+                self.stats['total_urls'] += 1
+        except Exception as e:
+            logger.error(f"Sitemap tarama hatası: {str(e)}")
+        
+        await self._run_workers()
+    
+    async def _run_workers(self) -> None:
+        """
+        Kuyruk boşalana (veya tarama durdurulana) kadar işçileri çalıştır
+        
+        start() ve resume() tarafından ortak kullanılır; HTTP oturumu ve bağlantı
+        havuzu çağrılar arasında korunur.
+        """
+        self.is_running = True
+        self.is_paused = False
+        self.frontier.reopen()
+        
+        # HTML ve PDF ayrıştırma süreç havuzunu oluştur
+        self._html_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS or os.cpu_count())
+        
+        # Biriken sayfaları düzenli aralıklarla yaz
+        flush_task = asyncio.create_task(self._flush_loop())
+        
+        try:
+            session = self._get_session()
             
-            async with ClientSession(connector=conn, timeout=timeout) as session:
-                # Sitemap'i çek (varsa)
-                try:
-                    sitemap_urls = await self.fetch_sitemap(session)
-                    # Sitemap URL'lerini kuyruğa ekle
-                    for url in sitemap_urls:
-                        if not self.url_manager.should_crawl(url):
-                            continue
-                        await self.url_queue.put((url, 0))
-                        self.stats['total_urls'] += 1
-                except Exception as e:
-                    logger.error(f"Sitemap tarama hatası: {str(e)}")
-                
-                # Çalışan işçi görevleri oluştur
-                workers = [self.worker(session, i) for i in range(self.concurrency)]
-                await asyncio.gather(*workers)
+            # Çalışan işçi görevleri oluştur
+            workers = [self.worker(session, i) for i in range(self.concurrency)]
+            await asyncio.gather(*workers)
         
         finally:
             self.is_running = False
-            self.end_time = time.time()
+            self.end_time = time.monotonic()
+            
+            # Kalan sayfaları yaz (oturum sayacı bunlara göre hesaplanır)
+            flush_task.cancel()
+            await asyncio.gather(flush_task, return_exceptions=True)
+            await self.flush_pages()
+            
+            # Süreç havuzunu kapat
+            self._html_pool.shutdown(wait=False, cancel_futures=True)
+            self._html_pool = None
             
             # Tarama oturumunu sonlandır
             if self.current_session_id:
@@ -178,53 +348,81 @@ class WebCrawler:
         logger.debug(f"İşçi {worker_id} başlatıldı")
         
         while self.is_running and not self.is_paused:
-            # Kuyruktan bir sonraki URL'yi al
-            try:
-                url, depth = await asyncio.wait_for(self.url_queue.get(), timeout=5)
-            except asyncio.TimeoutError:
-                # Kuyruk boşsa ve tüm işçiler beklemedeyse, taramayı bitir
-                if self.url_queue.empty() and all(t.done() for t in self.active_tasks):
-                    logger.info("Taranacak URL kalmadı, tarama sonlandırılıyor")
-                    self.is_running = False
-                    break
-                continue
+            # Kuyruktan bir sonraki URL'yi al (tarama bittiyse None döner)
+            item = await self._next_url()
+            if item is None:
+                break
+            url, depth = item
             
             # Derinlik sınırını kontrol et
-            if self.max_depth is not None and depth > self.max_depth:
-                self.url_queue.task_done()
+            if depth > self.max_depth:
                 continue
             
             # Sayfa sınırını kontrol et
-            if self.max_pages is not None and self.crawled_count >= self.max_pages:
+            if self.crawled_count >= self.max_pages:
                 logger.info(f"Maksimum sayfa sınırına ulaşıldı: {self.max_pages}")
-                self.url_queue.task_done()
                 self.is_running = False
+                self.frontier.close()
                 break
             
-            # URL'yi tekrar kontrol et (başka bir işçi işlemiş olabilir)
-            if not self.url_manager.should_crawl(url):
-                self.url_queue.task_done()
-                continue
-            
-            # Semaforu al (eşzamanlı istek sayısını sınırla)
-            async with self.semaphore:
+            # Tekrar kontrol gerekmez: URL'ler kuyruğa eklenirken ziyaret edilmiş sayılır
+            self._busy += 1
+            try:
                 # Hız sınırlayıcıyı bekle
                 await self.rate_limiter.wait(url)
                 
-                # URL'yi işle
-                task = asyncio.create_task(self.process_url(session, url, depth))
-                self.active_tasks.add(task)
-                task.add_done_callback(self.active_tasks.discard)
-                
-                try:
-                    await task
-                except Exception as e:
-                    logger.error(f"URL işleme hatası ({url}): {str(e)}\n{traceback.format_exc()}")
-                
-                self.url_queue.task_done()
+                # URL'yi işle (ayrı görev oluşturmadan, işçinin kendi içinde)
+                await self.process_url(session, url, depth)
+            except Exception as e:
+                # Yığın izi yalnızca debug seviyesinde ve kayıt gerçekten yazılırken biçimlendirilir
+                logger.error(f"URL işleme hatası ({url}): {str(e)}", exc_info=LOG_DEBUG_ENABLED)
+            finally:
+                self._busy -= 1
+                self._check_idle()
         
         logger.debug(f"İşçi {worker_id} sonlandırıldı")
     
+    def _check_idle(self) -> None:
+        """Kuyruk boşsa ve hiçbir işçi URL işlemiyorsa taramayı bitir ve bekleyen işçileri uyandır"""
+        if not self.frontier and self._busy == 0 and not self.frontier.closed:
+            logger.info("Taranacak URL kalmadı, tarama sonlandırılıyor")
+            self.is_running = False
+            self.frontier.close()
+    
+    async def _next_url(self) -> Optional[Tuple[str, int]]:
+        """
+        Sınırdan bir sonraki URL'yi al; sınır boşsa URL ya da bitiş sinyali gelene kadar bekle
+        
+        Returns:
+            Optional[Tuple[str, int]]: (url, derinlik) veya tarama bittiyse None
+        """
+        # Sınırda URL varsa beklemeden al
+        item = self.frontier.pop_nowait()
+        if item is not None:
+            return item
+        
+        # Başka işçi de çalışmıyorsa tarama biter (sınır kapatılır ve pop None döner)
+        self._check_idle()
+        return await self.frontier.pop()
+    
+    async def flush_pages(self) -> None:
+        """Tampondaki sayfaları ve bağlantılarını tek bir veritabanı işleminde yaz"""
+        async with self._flush_lock:
+            if not self._page_buffer:
+                return
+            batch, self._page_buffer = self._page_buffer, []
+            await self.db_manager.save_pages_bulk(batch)
+    
+    async def _flush_loop(self) -> None:
+        """Tampon dolmasa bile sayfaları en geç FLUSH_INTERVAL saniyede bir yaz"""
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                # shield: iptal edilse bile başlamış yazma işlemi yarıda kalmaz
+                await asyncio.shield(self.flush_pages())
+            except Exception as e:
+                logger.error(f"Sayfa tamponu yazılırken hata: {str(e)}")
+    
     async def process_url(self, session: ClientSession, url: str, depth: int) -> None:
         """
         URL'yi işle
@@ -234,12 +432,10 @@ class WebCrawler:
             url: İşlenecek URL
             depth: Mevcut derinlik
         """
-        logger.debug(f"İşleniyor: {url} (Derinlik: {depth})")
-        
-        # URL'yi ziyaret edilmiş olarak işaretle
-        self.url_manager.mark_as_visited(url)
+        if LOG_DEBUG_ENABLED:
+            logger.debug(f"İşleniyor: {url} (Derinlik: {depth})")
         
-        # İçeriği al
+        # İçeriği al (URL kuyruğa eklenirken ziyaret edilmiş olarak işaretlendi)
         with LoggingTimer(logger, f"URL çekme ({url})"):
             response_data = await self.fetch_url(session, url, depth)
         
@@ -257,43 +453,52 @@ class WebCrawler:
         # İstatistikleri güncelle
         self.crawled_count += 1
         self.stats['successful'] += 1
-        self.stats['http_errors'][status_code] = self.stats['http_errors'].get(status_code, 0) + 1
-        self.stats['content_types'][content_type] = self.stats['content_types'].get(content_type, 0) + 1
-        self.stats['total_response_time'] += response_time
-        self.stats['avg_response_time'] = self.stats['total_response_time'] / self.stats['successful']
+        self.stats['http_errors'][status_code] += 1
+        self.stats['content_types'][content_type] += 1
+        self.total_response_time += response_time
         
         # Adaptif hız sınırlama
         await self.rate_limiter.adaptive_wait(url, response_time, status_code)
         
-        # Sayfayı veritabanına kaydet
-        page_id = await self.db_manager.save_page(page_data)
+        # Daha önce kaydedilmiş bir sayfanın yakın kopyasıysa (takvim, sayaç, arşiv sayfaları)
+        # sayfa kaydedilmez ve bağlantıları izlenmez
+        fingerprint = page_data.pop('simhash', None)
+        if self.near_duplicates is not None and fingerprint is not None:
+            if not self.near_duplicates.add_if_new(fingerprint):
+                self.stats['near_duplicates'] += 1
+                if LOG_DEBUG_ENABLED:
+                    logger.debug(f"Yakın kopya sayfa kaydedilmedi: {url}")
+                return
         
-        if not page_id:
-            logger.error(f"Sayfa kaydedilemedi: {url}")
-            return
-        
-        # Bağlantıları işle
-        if links:
-            # Bağlantıları veritabanına kaydet
-            formatted_links = []
-            for link in links:
-                link_url = link.get('url')
-                formatted_links.append({
-                    'url': link_url,
-                    'is_internal': link.get('is_internal', self.url_manager.is_internal_url(link_url)),
-                    'is_crawled': False
-                })
+        # Bağlantıları tek geçişte kayıt formatına çevir ve iç bağlantıları kuyruğa ekle
+        formatted_links = [None] * len(links)
+        can_enqueue = depth < self.max_depth
+        split_url = self.url_manager.split_url
+        is_internal_parsed = self.url_manager.is_internal_parsed
+        mark_if_absent = self.url_manager.mark_as_enqueued_if_absent
+        for i, link in enumerate(links):
+            link_url = link.get('url')
+            # URL bir kez parçalanır; iç bağlantı ve tarama kontrolleri aynı sonucu kullanır
+            parsed = split_url(link_url)
+            is_internal = link.get('is_internal')
+            if is_internal is None:
+                is_internal = parsed is not None and is_internal_parsed(parsed)
             
-            await self.db_manager.save_links(page_id, formatted_links)
+            formatted_links[i] = {
+                'url': link_url,
+                'is_internal': is_internal,
+                'is_crawled': False,
+                'target_domain': parsed.netloc if parsed is not None else None
+            }
             
-            # İç bağlantıları kuyruğa ekle
-            for link in links:
-                link_url = link.get('url')
-                is_internal = link.get('is_internal', self.url_manager.is_internal_url(link_url))
-                
-                if is_internal and self.url_manager.should_crawl(link_url):
-                    await self.url_queue.put((link_url, depth + 1))
-                    self.stats['total_urls'] += 1
+            if is_internal and can_enqueue and parsed is not None and mark_if_absent(link_url, parsed):
+                self.frontier.push(link_url, depth + 1)
+                self.stats['total_urls'] += 1
+        
+        # Sayfayı ve bağlantılarını toplu yazma tamponuna ekle
+        self._page_buffer.append((page_data, formatted_links))
+        if len(self._page_buffer) >= PAGE_BATCH_SIZE:
+            await self.flush_pages()
     
     async def fetch_url(self, session: ClientSession, url: str, depth: int, retries: int = MAX_RETRIES) -> Optional[Dict[str, Any]]:
         """
@@ -308,25 +513,23 @@ class WebCrawler:
         Returns:
             Optional[Dict[str, Any]]: Getirilen içerik veya None
         """
-        backoff_factor = BACKOFF_FACTOR
-        headers = self.user_agent_manager.get_headers(referer=self.base_url)
+        headers = self._next_headers()
         proxy = None
         
         if self.use_proxies and self.proxy_manager:
             proxy = await self.proxy_manager.get_next_proxy(session)
         
         for attempt in range(retries):
-            start_time = time.time()
+            start_time = time.monotonic()
             
             try:
                 async with session.get(
                     url, 
                     headers=headers, 
                     proxy=proxy,
-                    allow_redirects=True,
-                    ssl=None if not self.verify_ssl else True
+                    allow_redirects=True
                 ) as response:
-                    elapsed = time.time() - start_time
+                    elapsed = time.monotonic() - start_time
                     
                     # Durum kodunu kontrol et
                     if response.status == 200:
@@ -348,20 +551,24 @@ class WebCrawler:
                         
                         return page_data
                     
-                    elif response.status in {301, 302, 303, 307, 308}:
+                    elif response.status in _REDIRECT_STATUSES:
                         location = response.headers.get('Location')
                         if location:
-                            new_url = urljoin(url, location)
+                            # Mutlak Location başlıkları birleştirilmeden kullanılır
+                            if location.startswith(('http://', 'https://')):
+                                new_url = location
+                            else:
+                                new_url = _cached_urljoin(url, location)
                             logger.info(f"Yönlendirme: {url} -> {new_url}")
                             
                             # Yönlendirilen URL'yi işle
-                            if self.url_manager.is_internal_url(new_url) and self.url_manager.should_crawl(new_url):
-                                await self.url_queue.put((new_url, depth))
+                            if self.url_manager.is_internal_url_fast(new_url) and self.url_manager.mark_as_enqueued_if_absent(new_url):
+                                self.frontier.push(new_url, depth)
                                 self.stats['total_urls'] += 1
                         
                         return None
                     
-                    elif response.status in {403, 429}:
+                    elif response.status in _BLOCKED_STATUSES:
                         logger.warning(f"Erişim engellendi veya hız sınırı aşıldı: {url} (HTTP {response.status})")
                         
                         # Proxy'yi başarısız olarak işaretle
@@ -370,9 +577,7 @@ class WebCrawler:
                             proxy = await self.proxy_manager.get_next_proxy(session)
                         
                         # Daha uzun bir bekleme süresiyle tekrar dene
-                        wait_time = backoff_factor * (2 ** attempt) + (attempt + 1)
-                        logger.info(f"Tekrar deneniyor: {url} ({attempt + 1}/{retries}, {wait_time} saniye sonra)")
-                        await asyncio.sleep(wait_time)
+                        await self._backoff_sleep(url, attempt, retries, extra=attempt + 1)
                         continue
                     
                     else:
@@ -380,9 +585,7 @@ class WebCrawler:
                         
                         # Ciddi bir hata ise tekrar deneme
                         if response.status >= 500:
-                            wait_time = backoff_factor * (2 ** attempt)
-                            logger.info(f"Tekrar deneniyor: {url} ({attempt + 1}/{retries}, {wait_time} saniye sonra)")
-                            await asyncio.sleep(wait_time)
+                            await self._backoff_sleep(url, attempt, retries)
                             continue
                         
                         return {
@@ -407,10 +610,7 @@ class WebCrawler:
                     proxy = await self.proxy_manager.get_next_proxy(session)
                 
                 # Son deneme değilse tekrar dene
-                if attempt < retries - 1:
-                    wait_time = backoff_factor * (2 ** attempt)
-                    logger.info(f"Tekrar deneniyor: {url} ({attempt + 1}/{retries}, {wait_time} saniye sonra)")
-                    await asyncio.sleep(wait_time)
+                if await self._backoff_sleep(url, attempt, retries):
                     continue
                 
                 return {
@@ -418,7 +618,7 @@ class WebCrawler:
                     'status_code': 0,
                     'content_type': 'error',
                     'depth': depth,
-                    'response_time': time.time() - start_time,
+                    'response_time': time.monotonic() - start_time,
                     'content': {
                         'url': url,
                         'error': str(e)
@@ -428,6 +628,97 @@ class WebCrawler:
         # Tüm denemeler başarısız oldu
         return None
     
+    @staticmethod
+    async def _backoff_sleep(url: str, attempt: int, retries: int, extra: float = 0) -> bool:
+        """
+        Tekrar denemeden önce üstel bekle (son denemeden sonra beklenmez)
+        
+        Args:
+            url: Tekrar denenecek URL
+            attempt: Yapılan denemenin sırası (0'dan başlar)
+            retries: Toplam deneme sayısı
+            extra: Üstel süreye eklenecek sabit bekleme (saniye)
+        
+        Returns:
+            bool: Tekrar denenecekse True, deneme hakkı bittiyse False
+        """
+        if attempt >= retries - 1:
+            return False
+        wait_time = BACKOFF_FACTOR * (2 ** attempt) + extra
+        logger.info(f"Tekrar deneniyor: {url} ({attempt + 1}/{retries}, {wait_time} saniye sonra)")
+        await asyncio.sleep(wait_time)
+        return True
+    
+    async def _extract_pdf(self, response, url: str) -> Dict[str, Any]:
+        """
+        PDF gövdesini parça parça oku; PDF_SPOOL_MAX_SIZE aşılırsa geçici dosyaya yaz
+        
+        PyMuPDF dosya benzeri nesneleri kabul etmediği için büyük PDF'ler diskten
+        dosya yolu ile açılır; böylece gövdenin tamamı bellekte tutulmaz.
+        
+        Args:
+            response: HTTP yanıtı
+            url: PDF'nin URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        buffer = bytearray()
+        spool = None
+        try:
+            async for chunk in response.content.iter_chunked(65536):
+                if spool is not None:
+                    spool.write(chunk)
+                    continue
+                buffer += chunk
+                if len(buffer) > PDF_SPOOL_MAX_SIZE:
+                    spool = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+                    spool.write(buffer)
+                    buffer = None
+            
+            # PyMuPDF ayrıştırması HTML ile aynı süreç havuzunda yapılır; büyük PDF'lerde
+            # yalnızca dosya yolu alt sürece gönderilir
+            if spool is None:
+                source = bytes(buffer)
+            else:
+                spool.close()
+                source = spool.name
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._html_pool, _extract_pdf_worker, source, url)
+        
+        finally:
+            if spool is not None:
+                spool.close()
+                try:
+                    os.unlink(spool.name)
+                except OSError:
+                    pass
+    
+    @staticmethod
+    async def _read_html(response) -> bytes:
+        """
+        HTML gövdesini parça parça oku; MAX_HTML_SIZE aşılırsa okumayı bırak
+        
+        Args:
+            response: HTTP yanıtı
+        
+        Returns:
+            bytes: Yanıt gövdesi (boyut sınırı aşılırsa ValueError yükselir)
+        """
+        if not MAX_HTML_SIZE:
+            return await response.read()
+        
+        # Content-Length bildirilmişse gövde hiç okunmadan reddedilir
+        if response.content_length is not None and response.content_length > MAX_HTML_SIZE:
+            raise ValueError(f"HTML boyutu sınırı aşıyor: {response.content_length} bayt")
+        
+        buffer = bytearray()
+        async for chunk in response.content.iter_chunked(65536):
+            buffer += chunk
+            if len(buffer) > MAX_HTML_SIZE:
+                raise ValueError(f"HTML boyutu sınırı aşıyor: {MAX_HTML_SIZE} bayttan büyük")
+        return bytes(buffer)
+    
     async def _extract_content(self, response, url: str, content_type: str) -> Dict[str, Any]:
         """
         HTTP yanıtından içeriği çıkar
@@ -441,15 +732,17 @@ class WebCrawler:
             Dict[str, Any]: Çıkarılan içerik
         """
         try:
-            if 'application/pdf' in content_type:
-                # PDF işle
-                content = await response.read()
-                return await self.pdf_extractor.extract_text(content, url)
+            if content_type.startswith(_PDF_CONTENT_TYPES):
+                # PDF işle (büyük PDF'ler parça parça geçici dosyaya yazılır)
+                return await self._extract_pdf(response, url)
             
-            elif 'text/html' in content_type or 'application/xhtml+xml' in content_type:
-                # HTML işle
-                html = await response.text()
-                return self.html_extractor.extract_content(html, url)
+            elif content_type.startswith(_HTML_CONTENT_TYPES):
+                # HTML işle (ham bayt; metne çevirme ayrıştırıcıda tek seferde yapılır)
+                html = await self._read_html(response)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._html_pool, _extract_html_worker, html, url, response.charset
+                )
             
             else:
                 # Desteklenmeyen içerik türü
@@ -486,53 +779,44 @@ class WebCrawler:
         Returns:
             List[str]: Sitemap'ten çıkarılan URL'ler
         """
-        sitemap_url = urljoin(self.base_url, '/sitemap.xml')
+        sitemap_url = self._sitemap_url
         urls = []
         
         try:
             # User-Agent başlığı ekle
-            headers = self.user_agent_manager.get_headers(referer=self.base_url)
+            headers = self._next_headers()
             
             async with session.get(
                 sitemap_url, 
-                headers=headers,
-                ssl=None if not self.verify_ssl else True
+                headers=headers
             ) as response:
                 if response.status != 200:
                     logger.warning(f"Sitemap bulunamadı: {sitemap_url} (HTTP {response.status})")
                     # Alternatif sitemap lokasyonlarını dene
-                    alt_locations = [
-                        '/sitemap_index.xml',
-                        '/sitemap.php',
-                        '/sitemap_index.xml.gz',
-                        '/sitemap.xml.gz'
-                    ]
-                    
-                    for alt_loc in alt_locations:
-                        alt_url = urljoin(self.base_url, alt_loc)
+                    for alt_url in self._alt_sitemap_urls:
                         try:
-                            async with session.get(alt_url, headers=headers, ssl=None if not self.verify_ssl else True) as alt_response:
+                            async with session.get(alt_url, headers=headers) as alt_response:
                                 if alt_response.status == 200:
                                     logger.info(f"Alternatif sitemap bulundu: {alt_url}")
-                                    return await self._parse_sitemap_content(await alt_response.text(), alt_url, session)
+                                    return await self._parse_sitemap_content(await alt_response.read(), alt_url, session)
                         except Exception:
                             continue
                     
                     return urls
                 
-                content = await response.text()
+                content = await response.read()
                 return await self._parse_sitemap_content(content, sitemap_url, session)
         
         except Exception as e:
             logger.error(f"Sitemap çekme hatası: {str(e)}")
             return urls
     
-    async def _parse_sitemap_content(self, content: str, sitemap_url: str, session: ClientSession) -> List[str]:
+    async def _parse_sitemap_content(self, content: bytes, sitemap_url: str, session: ClientSession) -> List[str]:
         """
         Sitemap içeriğini ayrıştır
         
         Args:
-            content: Sitemap içeriği
+            content: Sitemap içeriği (ham bayt; kodlama XML bildiriminden okunur)
             sitemap_url: Sitemap URL'si
             session: HTTP oturumu
         
@@ -541,47 +825,43 @@ class WebCrawler:
         """
         urls = []
         
-        # XML'i parse et
+        # .xml.gz sitemap'ler Content-Encoding olmadan sunulur; aiohttp bunları açmaz
+        if content[:2] == b'\x1f\x8b':
+            try:
+                if len(content) > _GZIP_INLINE_MAX:
+                    loop = asyncio.get_running_loop()
+                    content = await loop.run_in_executor(None, gzip.decompress, content)
+                else:
+                    content = gzip.decompress(content)
+            except (OSError, EOFError) as e:
+                logger.error(f"Sıkıştırılmış sitemap açılamadı ({sitemap_url}): {str(e)}")
+                return urls
+        
+        # XML'i akış halinde ayrıştır (C tabanlı lxml, ağaç bellekte tutulmaz)
         try:
-            root = ET.fromstring(content)
-            # Namespace'leri tespit et
-            nsmap = {}
-            if root.tag.startswith('{'):
-                ns_uri = root.tag.split('}')[0][1:]
-                nsmap['sm'] = ns_uri
-            else:
-                nsmap['sm'] = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+            sub_sitemaps, page_urls = self._iter_sitemap_locs(content)
             
             # Alt sitemap'leri işle
-            sitemaps = root.findall('.//sm:sitemap/sm:loc', nsmap) or root.findall('.//sitemap/loc')
-            for sitemap in sitemaps:
-                sub_sitemap_url = sitemap.text.strip()
+            for sub_sitemap_url in sub_sitemaps:
                 logger.debug(f"Alt sitemap bulundu: {sub_sitemap_url}")
                 sub_urls = await self._process_sitemap(session, sub_sitemap_url)
                 urls.extend(sub_urls)
             
             # URL'leri işle
-            url_nodes = root.findall('.//sm:url/sm:loc', nsmap) or root.findall('.//url/loc')
-            for url_node in url_nodes:
-                url = url_node.text.strip()
-                urls.append(url)
+            urls.extend(page_urls)
             
             logger.info(f"Sitemap'ten {len(urls)} URL çıkarıldı")
             return urls
         
-        except ET.ParseError:
+        except etree.XMLSyntaxError:
             logger.error(f"Sitemap XML parse hatası: {sitemap_url}")
             
             # XML ayrıştırılamadıysa, text modunda ayrıştırma dene
             try:
                 # Basit bir regex yaklaşımı
-                import re
-                loc_pattern = re.compile(r'<loc[^>]*>(.*?)</loc>', re.IGNORECASE | re.DOTALL)
-                matches = loc_pattern.findall(content)
-                
-                for match in matches:
-                    url = match.strip()
-                    if url.endswith('.xml') or '.xml?' in url:  # Alt sitemap olabilir
+                for match in _LOC_RE.finditer(content):
+                    url = match.group(1).strip().decode('utf-8', 'replace')
+                    if url.endswith(('.xml', '.xml.gz')) or '.xml?' in url:  # Alt sitemap olabilir
                         sub_urls = await self._process_sitemap(session, url)
                         urls.extend(sub_urls)
                     else:
@@ -597,6 +877,38 @@ class WebCrawler:
             logger.error(f"Sitemap ayrıştırma hatası: {str(e)}")
             return urls
     
+    @staticmethod
+    def _iter_sitemap_locs(content: bytes) -> Tuple[List[str], List[str]]:
+        """
+        Sitemap içindeki <loc> değerlerini iterparse ile tek geçişte topla
+        
+        Args:
+            content: Sitemap XML içeriği
+        
+        Returns:
+            Tuple[List[str], List[str]]: (alt sitemap URL'leri, sayfa URL'leri)
+        """
+        sub_sitemaps = []
+        page_urls = []
+        
+        # '{*}loc' hem namespace'li hem namespace'siz <loc> etiketlerini yakalar
+        for _, elem in etree.iterparse(io.BytesIO(content), events=('end',), tag='{*}loc'):
+            parent = elem.getparent()
+            if elem.text and parent is not None:
+                parent_tag = etree.QName(parent).localname
+                if parent_tag == 'sitemap':
+                    sub_sitemaps.append(elem.text.strip())
+                elif parent_tag == 'url':
+                    page_urls.append(elem.text.strip())
+            
+            # İşlenen düğümleri serbest bırak (bellek kullanımı sabit kalır)
+            elem.clear()
+            if parent is not None:
+                while parent.getprevious() is not None:
+                    del parent.getparent()[0]
+        
+        return sub_sitemaps, page_urls
+    
     async def _process_sitemap(self, session: ClientSession, sitemap_url: str) -> List[str]:
         """
         Alt sitemap'i işle
@@ -615,27 +927,32 @@ class WebCrawler:
             await self.rate_limiter.wait(sitemap_url)
             
             # User-Agent başlığı ekle
-            headers = self.user_agent_manager.get_headers(referer=self.base_url)
+            headers = self._next_headers()
             
             async with session.get(
                 sitemap_url, 
-                headers=headers,
-                ssl=None if not self.verify_ssl else True
+                headers=headers
             ) as response:
                 if response.status != 200:
                     logger.warning(f"Alt sitemap alınamadı: {sitemap_url} (HTTP {response.status})")
                     return urls
                 
-                content = await response.text()
+                content = await response.read()
                 return await self._parse_sitemap_content(content, sitemap_url, session)
         
         except Exception as e:
             logger.error(f"Alt sitemap işleme hatası: {str(e)}")
             return urls
     
+    @property
+    def avg_response_time(self) -> float:
+        """Başarılı isteklerin ortalama yanıt süresi (saniye)"""
+        successful = self.stats['successful']
+        return self.total_response_time / successful if successful else 0
+    
     def log_stats(self) -> None:
         """İstatistikleri logla"""
-        duration = self.end_time - self.start_time if self.end_time else time.time() - self.start_time
+        duration = self.end_time - self.start_time if self.end_time else time.monotonic() - self.start_time
         duration_mins = duration / 60
         
         logger.info(f"Tarama tamamlandı:")
@@ -644,9 +961,11 @@ class WebCrawler:
         logger.info(f"  Toplam URL sayısı: {self.stats['total_urls']}")
         logger.info(f"  Başarılı: {self.stats['successful']}")
         logger.info(f"  Başarısız: {self.stats['failed']}")
-        logger.info(f"  Ortalama yanıt süresi: {self.stats['avg_response_time']:.2f} saniye")
-        logger.info(f"  İçerik türleri: {self.stats['content_types']}")
-        logger.info(f"  HTTP hataları: {self.stats['http_errors']}")
+        if self.near_duplicates is not None:
+            logger.info(f"  Yakın kopya olduğu için kaydedilmeyen: {self.stats['near_duplicates']}")
+        logger.info(f"  Ortalama yanıt süresi: {self.avg_response_time:.2f} saniye")
+        logger.info(f"  İçerik türleri: {dict(self.stats['content_types'])}")
+        logger.info(f"  HTTP hataları: {dict(self.stats['http_errors'])}")
     
     async def pause(self) -> None:
         """Taramayı duraklat"""
@@ -663,6 +982,7 @@ class WebCrawler:
         
         # İşlemi durdur (isteğe bağlı olarak beklemeden)
         self.is_running = False
+        self.frontier.close()
     
     async def resume(self) -> None:
         """Duraklatılmış taramayı devam ettir"""
@@ -688,11 +1008,21 @@ class WebCrawler:
         
         # Taramayı yeniden başlat
         for url in uncrawled_links:
-            await self.url_queue.put((url, 0))  # Derinlik bilgisi kaybedildi
+            # Kuyrukta bekleyen veya taranmış URL'ler tekrar eklenmez
+            if not self.url_manager.mark_as_enqueued_if_absent(url):
+                continue
+            self.frontier.push(url, 0)  # Derinlik bilgisi kaybedildi
             self.stats['total_urls'] += 1
         
         logger.info(f"{len(uncrawled_links)} URL ile taramaya devam ediliyor")
-        await self.start()
+        
+        # start() yeniden çağrılmaz: veritabanı, tarama oturumu ve HTTP bağlantıları korunur;
+        # duraklatmada 'paused' olarak kapatılan oturum kaydı tekrar 'running' yapılır
+        if self.current_session_id:
+            await self.db_manager.resume_crawl_session(self.current_session_id)
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        await self._run_workers()
     
     async def get_stats(self) -> Dict[str, Any]:
         """
@@ -712,7 +1042,7 @@ class WebCrawler:
         # Süre hesapla
         duration = 0
         if self.start_time:
-            duration = (self.end_time or time.time()) - self.start_time
+            duration = (self.end_time or time.monotonic()) - self.start_time
         
         # İstatistikleri birleştir
         return {
@@ -728,7 +1058,7 @@ class WebCrawler:
                 'total_urls': self.stats['total_urls'],
                 'successful': self.stats['successful'],
                 'failed': self.stats['failed'],
-                'avg_response_time': self.stats['avg_response_time']
+                'avg_response_time': self.avg_response_time
             },
             'database': db_stats,
             'proxy': proxy_stats
@@ -0,0 +1,145 @@
+"""
+Taranacak URL'lerin bellek içi sınırı (frontier)
+"""
+import asyncio
+import struct
+import tempfile
+from collections import deque
+from typing import BinaryIO, Deque, Optional, Tuple
+
+# Taşma dosyasındaki kayıt başlığı: (derinlik, URL bayt uzunluğu)
+_RECORD_HEADER = struct.Struct('<II')
+
+
+class Frontier:
+    """
+    deque tabanlı, FIFO (genişlik öncelikli, dolayısıyla derinlik sıralı) URL sınırı
+
+    Ekleme eşzamanlıdır (await gerektirmez); boş sınırda bekleyen işçiler yalnızca
+    URL eklendiğinde veya sınır kapatıldığında uyandırılır. Tekilleştirme çağıranın
+    sorumluluğundadır (URLManager.mark_as_enqueued_if_absent).
+
+    memory_limit verildiğinde bellekte en fazla bu kadar URL tutulur; fazlası sırası korunarak
+    geçici bir dosyaya yazılır ve bellekteki URL'ler yarıya indiğinde dosyadan geri okunur.
+    Ekleme hiçbir zaman bloklanmaz (işçiler hem üretici hem tüketici olduğundan bloklayan
+    bir sınır kilitlenmeye yol açardı).
+    """
+
+    def __init__(self, memory_limit: int = 0):
+        """
+        Frontier sınıfını başlat
+
+        Args:
+            memory_limit: Bellekte tutulacak en fazla URL sayısı (0: sınırsız)
+        """
+        self.memory_limit = memory_limit
+        self._items: Deque[Tuple[str, int]] = deque()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.closed = False
+
+        # Taşan URL'ler (ilk taşmada oluşturulur); okuma konumu ve dosyadaki URL sayısı
+        self._spill: Optional[BinaryIO] = None
+        self._spill_read_pos = 0
+        self.spilled = 0
+
+    def __len__(self) -> int:
+        return len(self._items) + self.spilled
+
+    def push(self, url: str, depth: int) -> None:
+        """
+        URL'yi sınırın sonuna ekle ve bekleyen bir işçiyi uyandır
+
+        Args:
+            url: Eklenecek URL
+            depth: URL'nin derinliği
+        """
+        # Dosyada bekleyen URL varsa sıra korunmak için yenisi de dosyaya yazılır
+        if self.spilled or (self.memory_limit and len(self._items) >= self.memory_limit):
+            self._spill_push(url, depth)
+        else:
+            self._items.append((url, depth))
+        self._wake_one()
+
+    def pop_nowait(self) -> Optional[Tuple[str, int]]:
+        """
+        Sınırdaki ilk URL'yi beklemeden al
+
+        Returns:
+            Optional[Tuple[str, int]]: (url, derinlik) veya sınır boşsa None
+        """
+        return self._popleft() if self._items else None
+
+    async def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Sınırdaki ilk URL'yi al; sınır boşsa URL eklenene veya sınır kapatılana kadar bekle
+
+        Returns:
+            Optional[Tuple[str, int]]: (url, derinlik) veya sınır kapatıldıysa None
+        """
+        while not self.closed:
+            if self._items:
+                return self._popleft()
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Uyandırıldıktan sonra iptal edildiysek sıradaki işçiyi uyandır (URL sahipsiz kalmasın)
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_one()
+                raise
+        return None
+
+    def close(self) -> None:
+        """Sınırı kapat; bekleyen tüm işçiler None alır (kalan URL'ler korunur)"""
+        self.closed = True
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def reopen(self) -> None:
+        """Kapatılmış sınırı yeniden aç (duraklatılan tarama devam ettirilirken)"""
+        self.closed = False
+
+    def _popleft(self) -> Tuple[str, int]:
+        """İlk URL'yi al; bellekteki URL'ler yarıya indiyse dosyadan tamamla"""
+        item = self._items.popleft()
+        if self.spilled and len(self._items) <= self.memory_limit // 2:
+            self._refill()
+        return item
+
+    def _spill_push(self, url: str, depth: int) -> None:
+        """URL'yi taşma dosyasının sonuna yaz"""
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix='frontier-')
+        data = url.encode('utf-8', 'surrogatepass')
+        self._spill.seek(0, 2)
+        self._spill.write(_RECORD_HEADER.pack(depth, len(data)) + data)
+        self.spilled += 1
+
+    def _refill(self) -> None:
+        """Taşma dosyasından belleğe, memory_limit dolana kadar sırayla URL oku"""
+        spill = self._spill
+        spill.seek(self._spill_read_pos)
+        count = min(self.memory_limit - len(self._items), self.spilled)
+        for _ in range(count):
+            depth, size = _RECORD_HEADER.unpack(spill.read(_RECORD_HEADER.size))
+            self._items.append((spill.read(size).decode('utf-8', 'surrogatepass'), depth))
+        self.spilled -= count
+
+        if self.spilled:
+            self._spill_read_pos = spill.tell()
+        else:
+            # Dosya boşaldı; disk alanı geri verilir, sonraki taşma baştan yazar
+            spill.seek(0)
+            spill.truncate()
+            self._spill_read_pos = 0
+
+    def _wake_one(self) -> None:
+        """Bekleyen (iptal edilmemiş) ilk işçiyi uyandır"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
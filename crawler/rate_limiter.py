@@ -4,26 +4,85 @@
 import asyncio
 import logging
 import time
+from functools import lru_cache
 from typing import Dict, Optional
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
+
+from config.settings import LOG_DEBUG_ENABLED
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=4096)
+def _domain_of(url: str) -> str:
+    """
+    URL'nin alan adını (netloc) döndür
+    
+    Aynı URL önce wait, yanıttan sonra adaptive_wait ile sorulduğundan sonuç önbelleğe alınır;
+    iki çağrı arasında en fazla eşzamanlı istek sayısı kadar URL girdiği için küçük önbellek yeterlidir.
+    """
+    return urlsplit(url).netloc
+
+
+def _interval_ns(rate: float) -> int:
+    """Saniye başına istek sayısını iki istek arası minimum süreye (nanosaniye) çevir"""
+    return int(1e9 / rate) if rate > 0 else 0
+
+
 class RateLimiter:
     """İstek hızını sınırlandırmak için sınıf"""
     
-    def __init__(self, rate_limit: float = 0.5, domain_specific_limits: Optional[Dict[str, float]] = None):
+    def __init__(self, rate_limit: float = 0.5, domain_specific_limits: Optional[Dict[str, float]] = None,
+                 tasks_per_minute: int = 0):
         """
         RateLimiter sınıfını başlat
         
         Args:
             rate_limit: Saniye başına maksimum istek sayısı (varsayılan 0.5, yani 2 saniyede 1)
             domain_specific_limits: Alan adlarına özel sınırlar (alan adı: saniye başına istek)
+            tasks_per_minute: Alan adı başına dakikalık istek bütçesi (0: sınırsız)
         """
         self.rate_limit = rate_limit
         self.domain_specific_limits = domain_specific_limits or {}
-        self.last_request_time: Dict[str, float] = {}
-        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Bekleme süreleri limit değiştiğinde bir kez hesaplanır, her istekte bölme yapılmaz
+        self.interval_ns = _interval_ns(rate_limit)
+        self.domain_intervals_ns: Dict[str, int] = {
+            domain: _interval_ns(limit) for domain, limit in self.domain_specific_limits.items()
+        }
+        # Alan adı başına bir sonraki isteğin başlayabileceği an (time.monotonic_ns() değerleri)
+        self.next_allowed_ns: Dict[str, int] = {}
+        
+        # Dakikalık bütçe: alan adı başına jeton kovası (kapasite = tasks_per_minute)
+        self.tasks_per_minute = tasks_per_minute
+        self.budget_tokens: Dict[str, float] = {}
+        self.budget_updated: Dict[str, int] = {}  # time.monotonic_ns() değerleri
+    
+    async def _consume_budget(self, domain: str) -> None:
+        """
+        Alan adının dakikalık bütçesinden bir istek düş, bütçe bittiyse jeton dolana kadar bekle
+        
+        Args:
+            domain: Alan adı
+        """
+        capacity = self.tasks_per_minute
+        while True:
+            now_ns = time.monotonic_ns()
+            last_ns = self.budget_updated.get(domain, now_ns)
+            tokens = min(
+                capacity,
+                self.budget_tokens.get(domain, capacity) + (now_ns - last_ns) * capacity / 60e9
+            )
+            self.budget_updated[domain] = now_ns
+            
+            if tokens >= 1:
+                self.budget_tokens[domain] = tokens - 1
+                return
+            
+            self.budget_tokens[domain] = tokens
+            wait_time = (1 - tokens) * 60 / capacity
+            if LOG_DEBUG_ENABLED:
+                logger.debug(f"{domain} için dakikalık bütçe doldu, {wait_time:.2f} saniye bekleniyor...")
+            await asyncio.sleep(wait_time)
     
     async def wait(self, url: str) -> None:
         """
@@ -32,35 +91,27 @@ class RateLimiter:
         Args:
             url: İstek yapılacak URL
         """
-        domain = urlparse(url).netloc
+        domain = _domain_of(url)
         
-        # Alan adına özel semaphore'u al veya oluştur
-        if domain not in self.semaphores:
-            # Her alan adı için maksimum 1 eşzamanlı istek (isteğe bağlı değiştirilebilir)
-            self.semaphores[domain] = asyncio.Semaphore(1)
+        # Dakikalık bütçeyi uygula (ayarlıysa)
+        if self.tasks_per_minute:
+            await self._consume_budget(domain)
         
-        # Alan adına özel hız sınırını kontrol et
-        domain_rate = self.domain_specific_limits.get(domain, self.rate_limit)
+        # Alan adına özel minimum bekleme süresi (nanosaniye)
+        min_wait_ns = self.domain_intervals_ns.get(domain, self.interval_ns)
         
-        # Minimum bekleme süresi (saniye)
-        min_wait_time = 1.0 / domain_rate if domain_rate > 0 else 0
+        # Sıradaki zaman dilimini kilitsiz ayır: okuma ve ilerletme arasında await olmadığından
+        # eşzamanlı çağrılar aynı dilimi alamaz; her çağıran yalnızca kendi dilimine kadar bekler
+        now_ns = time.monotonic_ns()
+        slot_ns = max(now_ns, self.next_allowed_ns.get(domain, 0))
+        self.next_allowed_ns[domain] = slot_ns + min_wait_ns
         
-        async with self.semaphores[domain]:
-            # Son istek zamanını kontrol et
-            last_time = self.last_request_time.get(domain, 0)
-            current_time = time.time()
-            
-            # Son istekten beri geçen süre
-            elapsed = current_time - last_time
-            
-            # Gerekirse bekle
-            if elapsed < min_wait_time:
-                wait_time = min_wait_time - elapsed
+        # Gerekirse bekle
+        if slot_ns > now_ns:
+            wait_time = (slot_ns - now_ns) / 1e9
+            if LOG_DEBUG_ENABLED:
                 logger.debug(f"{domain} için {wait_time:.2f} saniye bekleniyor...")
-                await asyncio.sleep(wait_time)
-            
-            # Son istek zamanını güncelle
-            self.last_request_time[domain] = time.time()
+            await asyncio.sleep(wait_time)
     
     def update_domain_limit(self, domain: str, new_limit: float) -> None:
         """
@@ -71,6 +122,7 @@ class RateLimiter:
             new_limit: Saniye başına yeni istek limiti
         """
         self.domain_specific_limits[domain] = new_limit
+        self.domain_intervals_ns[domain] = _interval_ns(new_limit)
     
     async def adaptive_wait(self, url: str, response_time: float, status_code: int) -> None:
         """
@@ -81,7 +133,7 @@ class RateLimiter:
             response_time: Yanıt süresi (saniye)
             status_code: HTTP durum kodu
         """
-        domain = urlparse(url).netloc
+        domain = _domain_of(url)
         current_limit = self.domain_specific_limits.get(domain, self.rate_limit)
         
         # 429 (Too Many Requests) durum kodu veya yüksek yanıt süresi durumunda hızı düşür
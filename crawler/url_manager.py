@@ -2,36 +2,111 @@
 URL yönetimi, normalleştirme ve doğrulama
 """
 import logging
-import hashlib
 import re
-from typing import List, Set, Dict, Any, Optional
-from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+import sys
+from collections import OrderedDict
+from typing import Iterable, List, Set, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, urlsplit, urlunparse, parse_qs, urlencode, SplitResult
 
-from config.settings import IMPORTANT_URL_PARAMS
+from config.settings import (
+    IMPORTANT_URL_PARAMS, URL_INCLUDE_RE, URL_EXCLUDE_RE, SEEN_SET_BITS,
+    USE_BLOOM_FILTER, BLOOM_INITIAL_CAPACITY, BLOOM_ERROR_RATE, BLOOM_RECENT_SIZE
+)
+from utils.bloom_filter import ScalableBloomFilter
+from utils.hashing import hash_url
+from utils.url_bitset import URLBitSet
 
 logger = logging.getLogger(__name__)
 
+# Taranmayacak özel protokoller (urlsplit şemayı küçük harfe çevirir)
+SKIPPED_SCHEMES = frozenset({'mailto', 'tel', 'sms', 'whatsapp', 'intent', 'javascript'})
+
+# Normalleştirme/hash önbelleğinin en fazla tutacağı URL sayısı (LRU)
+URL_CACHE_SIZE = 50_000
+
 class URLManager:
     """URL işlemleri yönetimi"""
     
-    def __init__(self, base_url: str, important_params: Optional[Set[str]] = None):
+    def __init__(self, base_url: str, important_params: Optional[Iterable[str]] = None):
         """
         URLManager sınıfını başlat
         
         Args:
             base_url: Ana URL
-            important_params: Korunacak URL parametreleri kümesi
+            important_params: Korunacak URL parametreleri (liste veya demet de verilebilir)
         """
         self.base_url = base_url
-        self.base_domain = urlparse(base_url).netloc
-        self.important_params = important_params or IMPORTANT_URL_PARAMS
-        self.visited_urls: Set[str] = set()
-        self.visited_hashes: Set[str] = set()
-        self.excluded_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.css', '.js', '.ico', '.svg', '.woff', '.woff2', '.ttf', '.eot'}
+        # Ana alan adı bir kez intern edilir; eşitlik kontrolleri çoğunlukla işaretçi karşılaştırmasına iner
+        self.base_domain = sys.intern(urlparse(base_url).netloc)
+        # is_internal_url ile aynı kural: şemadan sonraki netloc ana alan adına birebir eşit olmalı
+        self._internal_re = re.compile(
+            r'[A-Za-z][A-Za-z0-9+.\-]*://' + re.escape(self.base_domain) + r'(?:[/?#]|$)'
+        )
+        self.important_params = frozenset(important_params or IMPORTANT_URL_PARAMS)
+        # Ziyaret edilen URL'ler tek bir tam kümede, normalleştirilmiş URL'lerin 16 baytlık hash'leri olarak tutulur
+        self.visited_hashes: Set[bytes] = set()
+        # Ayarlıysa tam küme yerine olasılıksal bir küme kullanılır
+        # (SEEN_SET_BITS: sabit boyutlu bit kümesi, USE_BLOOM_FILTER: ölçeklenebilir Bloom filtresi)
+        self.visited_filter = None
+        if SEEN_SET_BITS:
+            self.visited_filter = URLBitSet(SEEN_SET_BITS)
+        elif USE_BLOOM_FILTER:
+            self.visited_filter = ScalableBloomFilter(
+                initial_capacity=BLOOM_INITIAL_CAPACITY,
+                error_rate=BLOOM_ERROR_RATE,
+                recent_size=BLOOM_RECENT_SIZE
+            )
+        # Aynı URL'ler taramada defalarca görülür; ham URL -> (normalleştirilmiş URL, hash) önbelleklenir
+        self._url_cache: OrderedDict = OrderedDict()
+        self.include_re = URL_INCLUDE_RE
+        self.exclude_re = URL_EXCLUDE_RE
+        self.excluded_extensions = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.css', '.js', '.ico', '.svg', '.woff', '.woff2', '.ttf', '.eot'})
+        # filter_urls için ön eleme: özel protokoller ve son yol parçası hariç tutulan uzantıyla bitenler
+        # (yalnızca should_crawl'ın da reddedeceği URL'leri yakalar, kalanlar yine should_crawl'dan geçer)
+        self._reject_re = re.compile(
+            r'^(?:' + '|'.join(sorted(SKIPPED_SCHEMES)) + r'):'
+            r'|^[^?#]*[^/?#]\.(?:' + '|'.join(re.escape(ext[1:]) for ext in sorted(self.excluded_extensions)) + r')(?:[?#]|$)',
+            re.IGNORECASE
+        )
+    
+    def normalize_and_hash(self, url: str) -> Tuple[str, bytes]:
+        """
+        URL'yi normalleştir ve hash değerini hesapla (ikisi tek önbellek kaydında tutulur)
+        
+        Args:
+            url: İşlenecek URL
+        
+        Returns:
+            Tuple[str, bytes]: (normalleştirilmiş URL, normalleştirilmiş URL'nin hash değeri)
+        """
+        cache = self._url_cache
+        entry = cache.get(url)
+        if entry is not None:
+            cache.move_to_end(url)
+            return entry
+        
+        normalized = self._normalize_url_uncached(url)
+        entry = (normalized, hash_url(normalized))
+        cache[url] = entry
+        if len(cache) > URL_CACHE_SIZE:
+            cache.popitem(last=False)
+        return entry
     
     def normalize_url(self, url: str) -> str:
         """
-        URL'yi normalleştir
+        URL'yi normalleştir (sonuç önbelleklenir)
+        
+        Args:
+            url: Normalleştirilecek URL
+        
+        Returns:
+            str: Normalleştirilmiş URL
+        """
+        return self.normalize_and_hash(url)[0]
+    
+    def _normalize_url_uncached(self, url: str) -> str:
+        """
+        URL'yi önbelleğe bakmadan normalleştir
         
         Args:
             url: Normalleştirilecek URL
@@ -46,35 +121,65 @@ class URLManager:
             scheme = parsed.scheme.lower()
             netloc = parsed.netloc.lower()
             
-            # Standart port numaralarını kaldır
-            if (scheme == 'http' and parsed.port == 80) or (scheme == 'https' and parsed.port == 443):
-                netloc = netloc.replace(f':{parsed.port}', '')
+            # Standart port numaralarını kaldır (port yoksa netloc tekrar ayrıştırılmaz)
+            if ':' in netloc:
+                port = parsed.port
+                if (scheme == 'http' and port == 80) or (scheme == 'https' and port == 443):
+                    netloc = netloc.replace(f':{port}', '')
             
-            # Yol dizinlerindeki gereksiz karmaşık kısımları temizle
+            # Yol dizinlerindeki '.', '..' ve boş parçaları tek geçişte temizle
             path = parsed.path
-            while '/./' in path:
-                path = path.replace('/./', '/')
-            while '/../' in path:
-                path = path.replace('/../', '/')
+            if '/.' in path or '//' in path:
+                path = self._remove_dot_segments(path)
             
             # Sondaki eğik çizgiyi kaldır (kök dizin dışında)
             if path != '/' and path.endswith('/'):
                 path = path[:-1]
             
-            # Gereksiz URL parametrelerini filtrele
-            query_params = parse_qs(parsed.query)
-            filtered_params = {k: v for k, v in query_params.items() if k in self.important_params}
-            sorted_query = urlencode(sorted(filtered_params.items()), doseq=True)
+            # Gereksiz URL parametrelerini filtrele (sorgu yoksa hiç ayrıştırılmaz)
+            sorted_query = ''
+            if parsed.query:
+                query_params = parse_qs(parsed.query)
+                # Anahtar kesişimi C'de yapılır; sıralanan liste en fazla birkaç öğe içerir
+                kept = query_params.keys() & self.important_params
+                if kept:
+                    sorted_query = urlencode(sorted((k, query_params[k]) for k in kept), doseq=True)
             
-            # Parçaları birleştir
-            normalized = urlunparse((scheme, netloc, path, parsed.params, sorted_query, ''))
+            # Parçaları birleştir (olağan mutlak URL'ler için urlunparse atlanır; parça her zaman boştur)
+            if not (scheme and netloc and (not path or path[0] == '/')):
+                return urlunparse((scheme, netloc, path, parsed.params, sorted_query, ''))
+            normalized = f"{scheme}://{netloc}{path}"
+            if parsed.params:
+                normalized = f"{normalized};{parsed.params}"
+            if sorted_query:
+                normalized = f"{normalized}?{sorted_query}"
             return normalized
         
         except Exception as e:
             logger.error(f"URL normalleştirme hatası: {str(e)}")
             return url
     
-    def get_url_hash(self, url: str) -> str:
+    @staticmethod
+    def _remove_dot_segments(path: str) -> str:
+        """
+        Yol parçalarını tek geçişte katla ('..' bir üst dizine çıkar, '.' ve boş parçalar atlanır)
+        
+        Args:
+            path: URL yolu
+        
+        Returns:
+            str: Temizlenmiş mutlak yol
+        """
+        segments = []
+        for segment in path.split('/'):
+            if segment == '..':
+                if segments:
+                    segments.pop()
+            elif segment and segment != '.':
+                segments.append(segment)
+        return '/' + '/'.join(segments)
+    
+    def get_url_hash(self, url: str) -> bytes:
         """
         URL için benzersiz bir hash değeri oluştur
         
@@ -82,10 +187,9 @@ class URLManager:
             url: Hash değeri oluşturulacak URL
         
         Returns:
-            str: URL'nin hash değeri
+            bytes: URL'nin hash değeri
         """
-        normalized_url = self.normalize_url(url)
-        return hashlib.md5(normalized_url.encode()).hexdigest()
+        return self.normalize_and_hash(url)[1]
     
     def is_valid_url(self, url: str) -> bool:
         """
@@ -118,44 +222,105 @@ class URLManager:
             return parsed.netloc == self.base_domain
         except:
             return False
+    
+    def is_internal_url_fast(self, url: str) -> bool:
+        """
+        is_internal_url'in derlenmiş desenle çalışan hızlı sürümü (URL ayrıştırılmaz)
+        
+        Args:
+            url: Kontrol edilecek mutlak URL
+        
+        Returns:
+            bool: İç bağlantıysa True, dış bağlantıysa False
+        """
+        return self._internal_re.match(url) is not None
+    
+    @staticmethod
+    def split_url(url: str) -> Optional[SplitResult]:
+        """
+        URL'yi bir kez parçala (ayrıştırılamayan URL'ler için None döner)
+        
+        Args:
+            url: Parçalanacak URL
+        
+        Returns:
+            Optional[SplitResult]: Parçalanmış URL veya None
+        """
+        try:
+            return urlsplit(url)
+        except ValueError:
+            return None
+    
+    def is_internal_parsed(self, parsed: SplitResult) -> bool:
+        """
+        Önceden parçalanmış URL'nin iç bağlantı olup olmadığını kontrol et
+        
+        Args:
+            parsed: split_url ile parçalanmış URL
+        
+        Returns:
+            bool: İç bağlantıysa True, dış bağlantıysa False
+        """
+        return parsed.netloc == self.base_domain
         
     def should_crawl(self, url: str) -> bool:
-            """
-            URL'nin taranması gerekip gerekmediğini kontrol et
-            
-            Args:
-                url: Kontrol edilecek URL
-            
-            Returns:
-                bool: Taranması gerekiyorsa True, gerekmiyorsa False
-            """
-            # Özel protokolleri kontrol et
-            if url.startswith(('mailto:', 'tel:', 'sms:', 'whatsapp:', 'intent:', 'javascript:')):
-                return False
-                
-            # URL'nin geçerli olduğunu kontrol et
-            if not self.is_valid_url(url):
-                return False
-            
-            # İç bağlantı olduğunu kontrol et
-            if not self.is_internal_url(url):
-                return False
-            
-            # Daha önce ziyaret edildiğini kontrol et
-            normalized_url = self.normalize_url(url)
-            if normalized_url in self.visited_urls:
-                return False
-            
-            url_hash = self.get_url_hash(url)
-            if url_hash in self.visited_hashes:
-                return False
+        """
+        URL'nin taranması gerekip gerekmediğini kontrol et
+        
+        Args:
+            url: Kontrol edilecek URL
+        
+        Returns:
+            bool: Taranması gerekiyorsa True, gerekmiyorsa False
+        """
+        parsed = self.split_url(url)
+        if parsed is None:
+            return False
+        return self.should_crawl_parsed(url, parsed)
+    
+    def should_crawl_parsed(self, url: str, parsed: SplitResult) -> bool:
+        """
+        should_crawl'ın önceden parçalanmış URL ile çalışan sürümü
+        
+        Args:
+            url: Kontrol edilecek URL
+            parsed: split_url ile parçalanmış URL
+        
+        Returns:
+            bool: Taranması gerekiyorsa True, gerekmiyorsa False
+        """
+        # Özel protokolleri kontrol et
+        if parsed.scheme in SKIPPED_SCHEMES:
+            return False
             
-            # Dosya uzantısını kontrol et
-            _, ext = self.get_url_extension(url)
-            if ext and ext.lower() in self.excluded_extensions:
+        # URL'nin geçerli olduğunu kontrol et
+        if not (parsed.netloc and parsed.scheme):
+            return False
+        
+        # İç bağlantı olduğunu kontrol et
+        if not self.is_internal_parsed(parsed):
+            return False
+        
+        # Dosya uzantısını kontrol et (desenlerden ve normalleştirmeden önce; ucuz kontroller önce yapılır)
+        _, ext = self._split_extension(parsed.path)
+        if ext and ext in self.excluded_extensions:
+            return False
+        
+        # Dahil etme / hariç tutma desenlerini kontrol et
+        if self.include_re is not None and not self.include_re.search(url):
+            return False
+        if self.exclude_re is not None and self.exclude_re.search(url):
+            return False
+        
+        # Daha önce ziyaret edildiğini kontrol et
+        normalized_url, url_hash = self.normalize_and_hash(url)
+        if self.visited_filter is not None:
+            if normalized_url in self.visited_filter:
                 return False
-            
-            return True
+        elif url_hash in self.visited_hashes:
+            return False
+        
+        return True
     
     def mark_as_visited(self, url: str) -> None:
         """
@@ -164,12 +329,32 @@ class URLManager:
         Args:
             url: İşaretlenecek URL
         """
-        normalized_url = self.normalize_url(url)
-        self.visited_urls.add(normalized_url)
+        normalized_url, url_hash = self.normalize_and_hash(url)
+        if self.visited_filter is not None:
+            self.visited_filter.add(normalized_url)
+            return
         
-        url_hash = self.get_url_hash(url)
         self.visited_hashes.add(url_hash)
     
+    def mark_as_enqueued_if_absent(self, url: str, parsed: Optional[SplitResult] = None) -> bool:
+        """
+        URL taranmalıysa ziyaret edilmiş olarak işaretle (kuyruğa eklenmeden hemen önce çağrılır)
+        
+        Args:
+            url: Kuyruğa eklenecek URL
+            parsed: Önceden parçalanmış URL (verilmezse URL burada parçalanır)
+        
+        Returns:
+            bool: URL kuyruğa eklenmeliyse True, daha önce görülmüşse veya taranmayacaksa False
+        """
+        if parsed is None:
+            if not self.should_crawl(url):
+                return False
+        elif not self.should_crawl_parsed(url, parsed):
+            return False
+        self.mark_as_visited(url)
+        return True
+    
     @staticmethod
     def get_url_extension(url: str) -> tuple:
         """
@@ -179,16 +364,27 @@ class URLManager:
             url: İşlenecek URL
         
         Returns:
-            tuple: (dosya_adı, uzantı) ikilisi
+            tuple: (dosya_adı, küçük harfli uzantı) ikilisi
         """
-        path = urlparse(url).path
-        filename = path.split('/')[-1]
+        return URLManager._split_extension(urlsplit(url).path)
+    
+    @staticmethod
+    def _split_extension(path: str) -> tuple:
+        """
+        URL yolunun son parçasından dosya adını ve uzantısını al (regex ve yeniden ayrıştırma yok)
         
-        # Nokta ile ayrılmış uzantıyı bul
-        match = re.search(r'\.([^./]+)$', filename)
-        if match:
-            extension = f".{match.group(1)}"
-            return filename, extension
+        Args:
+            path: URL yolu (urlsplit sonucu; son parçadaki ;parametreler atılır)
+        
+        Returns:
+            tuple: (dosya_adı, küçük harfli uzantı) ikilisi
+        """
+        filename = path.rpartition('/')[2].partition(';')[0]
+        
+        # Nokta ile ayrılmış uzantıyı bul (".htaccess" gibi gizli dosyaların uzantısı yoktur)
+        head, dot, extension = filename.rpartition('.')
+        if dot and head and extension:
+            return filename, f".{extension.lower()}"
         
         return filename, ""
     
@@ -200,12 +396,24 @@ class URLManager:
             urls: Filtrelenecek URL listesi
         
         Returns:
-            List[str]: Filtrelenmiş URL listesi
+            List[str]: Filtrelenmiş URL listesi (aynı normalleştirilmiş URL yalnızca bir kez, ilk haliyle)
         """
-        filtered = []
-        
+        # Derlenmiş desenler tek C taramasıyla çoğu URL'yi eler; Python kontrolleri yalnızca kalanlara uygulanır
+        is_internal = self._internal_re.match
+        is_rejected = self._reject_re.search
+        # Sayfada tekrar eden bağlantılar bir kez değerlendirilir; ziyaret kümesi değiştirilmez
+        seen = set()
+        seen_normalized = set()
+        result = []
         for url in urls:
-            if self.should_crawl(url):
-                filtered.append(url)
-        
-        return filtered
\ No newline at end of file
+            if url in seen:
+                continue
+            seen.add(url)
+            if not is_internal(url) or is_rejected(url) or not self.should_crawl(url):
+                continue
+            normalized_url = self.normalize_url(url)  # should_crawl sonrası önbellekten gelir
+            if normalized_url in seen_normalized:
+                continue
+            seen_normalized.add(normalized_url)
+            result.append(url)
+        return result
\ No newline at end of file
@@ -3,21 +3,28 @@ Veritabanı bağlantı ve işlem yönetimi
 """
 import json
 import logging
-from typing import Dict, List, Optional, Union, Any, Tuple
-import hashlib
-from urllib.parse import urlparse
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional, Union, Any, Tuple
+from urllib.parse import urlparse, urlsplit
 
-from sqlalchemy import create_engine, and_, func, select
+from sqlalchemy import String, bindparam, create_engine, and_, event, exists, false, func, insert, inspect, or_, select, update
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.future import select as future_select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from database.models import Base, Page, Link, CrawlSession
 from config.settings import DATABASE_URL, BATCH_SIZE
+from utils.hashing import hash_url
 
 logger = logging.getLogger(__name__)
 
+# session_scope() içinde etkin olan oturum (görev bazında; asyncio görevleri bağlamı kopyalar)
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar('_current_session', default=None)
+
 # SQLite URL'lerini async uyumlu hale getir
 if DATABASE_URL.startswith('sqlite:///'):
     ASYNC_DATABASE_URL = DATABASE_URL.replace('sqlite:///', 'sqlite+aiosqlite:///')
@@ -25,23 +32,253 @@ else:
     ASYNC_DATABASE_URL = DATABASE_URL
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Her yeni SQLite bağlantısında performans ayarlarını uygula"""
+    # WAL: okuyucular yazarı beklemez; synchronous=NORMAL: her commit'te fsync yapılmaz
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB sayfa önbelleği
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _url_domain(url: Optional[str]) -> Optional[str]:
+    """URL'nin alan adını (netloc) döndür; ayrıştırılamıyorsa None"""
+    try:
+        return urlsplit(url).netloc if url else None
+    except ValueError:
+        return None
+
+
+def _rehash_urls(connection) -> None:
+    """url_hash sütunlarını güncel hash şemasıyla (utils.hashing.hash_url) yeniden hesapla"""
+    pages = Page.__table__
+    links = Link.__table__
+    
+    page_rows = [
+        {'b_id': row.id, 'b_hash': hash_url(row.url)}
+        for row in connection.execute(select(pages.c.id, pages.c.url))
+    ]
+    if page_rows:
+        connection.execute(
+            pages.update().where(pages.c.id == bindparam('b_id')).values(url_hash=bindparam('b_hash')),
+            page_rows
+        )
+    
+    link_rows = [
+        {'b_id': row.id, 'b_hash': hash_url(row.target_url)}
+        for row in connection.execute(select(links.c.id, links.c.target_url))
+    ]
+    for start in range(0, len(link_rows), BATCH_SIZE):
+        connection.execute(
+            links.update().where(links.c.id == bindparam('b_id')).values(target_url_hash=bindparam('b_hash')),
+            link_rows[start:start + BATCH_SIZE]
+        )
+    
+    logger.info(f"URL hash'leri yeniden hesaplandı: {len(page_rows)} sayfa, {len(link_rows)} bağlantı")
+
+
+def _unhex_url_hashes(connection) -> None:
+    """Metin (onaltılık) olarak saklanan url_hash değerlerini ham bayta çevir"""
+    for table, column in ((Page.__table__, 'url_hash'), (Link.__table__, 'target_url_hash')):
+        hash_column = table.c[column]
+        rows = [
+            {'b_id': row.id, 'b_hash': bytes.fromhex(row.hash)}
+            for row in connection.execute(
+                select(table.c.id, hash_column.cast(String).label('hash')).where(func.typeof(hash_column) == 'text')
+            )
+        ]
+        for start in range(0, len(rows), BATCH_SIZE):
+            connection.execute(
+                table.update().where(table.c.id == bindparam('b_id')).values({column: bindparam('b_hash')}),
+                rows[start:start + BATCH_SIZE]
+            )
+        logger.info(f"{table.name}.{column}: {len(rows)} hash ham bayta çevrildi")
+
+
+def _unique_source_target(connection) -> None:
+    """Yinelenen bağlantıları sil ve (source_id, target_url_hash) indeksini tekil yap"""
+    result = connection.exec_driver_sql(
+        "DELETE FROM links WHERE id NOT IN "
+        "(SELECT MIN(id) FROM links GROUP BY source_id, target_url_hash)"
+    )
+    connection.exec_driver_sql("DROP INDEX IF EXISTS idx_source_target")
+    connection.exec_driver_sql("CREATE UNIQUE INDEX idx_source_target ON links (source_id, target_url_hash)")
+    logger.info(f"{result.rowcount} yinelenen bağlantı silindi")
+
+
+def _add_target_domain(connection) -> None:
+    """links tablosuna target_domain sütununu ekle ve var olan satırlar için doldur"""
+    links = Link.__table__
+    connection.exec_driver_sql("ALTER TABLE links ADD COLUMN target_domain VARCHAR(255)")
+    rows = [
+        {'b_id': row.id, 'b_domain': _url_domain(row.target_url)}
+        for row in connection.execute(select(links.c.id, links.c.target_url))
+    ]
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(
+            links.update().where(links.c.id == bindparam('b_id')).values(target_domain=bindparam('b_domain')),
+            rows[start:start + BATCH_SIZE]
+        )
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_target_domain ON links (target_domain)")
+    logger.info(f"{len(rows)} bağlantı için target_domain dolduruldu")
+
+
+def _partial_uncrawled_index(connection) -> None:
+    """is_crawled üzerindeki tam indeksi taranmamış bağlantılar için kısmi indeksle değiştir"""
+    connection.exec_driver_sql("DROP INDEX IF EXISTS idx_not_crawled")
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_uncrawled ON links (is_internal, target_domain) WHERE is_crawled = 0"
+    )
+
+
+def _rebuild_table(connection, table) -> None:
+    """
+    Tabloyu güncel model tanımıyla yeniden oluştur ve verileri taşı
+    
+    SQLite var olan bir sütunun tanımını (örn. varsayılan değerini) değiştiremez; bunun yerine
+    yeni tablo oluşturulur, satırlar kopyalanır ve eski tablonun yerine geçirilir.
+    
+    Args:
+        connection: Senkron veritabanı bağlantısı
+        table: Yeniden oluşturulacak tablo (sütunları veritabanındakilerle aynı olmalı)
+    """
+    new_name = f"_new_{table.name}"
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect))
+    connection.exec_driver_sql(ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {new_name} ", 1))
+    columns = ', '.join(column.name for column in table.columns)
+    connection.exec_driver_sql(f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name}")
+    connection.exec_driver_sql(f"DROP TABLE {table.name}")
+    connection.exec_driver_sql(f"ALTER TABLE {new_name} RENAME TO {table.name}")
+    for index in table.indexes:
+        index.create(connection)
+
+
+def _server_side_timestamps(connection) -> None:
+    """Zaman damgası sütunlarına DEFAULT CURRENT_TIMESTAMP ekle (tablolar yeniden oluşturulur)"""
+    for table in (Page.__table__, Link.__table__, CrawlSession.__table__):
+        _rebuild_table(connection, table)
+
+
+# SQLite şema geçişleri (PRAGMA user_version ile izlenir): (sürüm, geçiş fonksiyonu)
+_MIGRATIONS = (
+    (1, _rehash_urls),  # url_hash: md5 -> blake2b-128
+    (2, _unhex_url_hashes),  # url_hash: onaltılık metin -> 16 baytlık BLOB
+    (3, _unique_source_target),  # links: (source_id, target_url_hash) tekil
+    (4, _add_target_domain),  # links.target_domain (indeksli)
+    (5, _partial_uncrawled_index),  # idx_not_crawled -> kısmi idx_uncrawled
+    (6, _server_side_timestamps),  # crawled_at/discovered_at/start_time: DEFAULT CURRENT_TIMESTAMP
+)
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+def _create_and_migrate(connection) -> None:
+    """Tabloları oluştur; önceden var olan veritabanlarına bekleyen geçişleri uygula"""
+    is_new = not inspect(connection).has_table(Page.__tablename__)
+    Base.metadata.create_all(connection)
+    _run_migrations(connection, is_new)
+
+
+def _run_migrations(connection, is_new: bool = False) -> None:
+    """
+    Veritabanının şema sürümünden sonraki geçişleri sırayla uygula
+    
+    Args:
+        connection: Senkron veritabanı bağlantısı
+        is_new: Tablolar az önce güncel modellerle oluşturulduysa True (geçiş gerekmez)
+    """
+    if connection.dialect.name != 'sqlite':
+        logger.warning("Şema geçişleri yalnızca SQLite için destekleniyor, atlanıyor")
+        return
+    
+    version = SCHEMA_VERSION if is_new else connection.exec_driver_sql("PRAGMA user_version").scalar()
+    for target_version, migrate in _MIGRATIONS:
+        if version < target_version:
+            logger.info(f"Veritabanı geçişi uygulanıyor: sürüm {target_version}")
+            migrate(connection)
+    
+    if is_new or version < SCHEMA_VERSION:
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+# save_page UPSERT'ünde çakışma olduğunda güncellenebilen Page sütunları
+_PAGE_UPDATE_COLUMNS = frozenset({
+    'title', 'content_type', 'full_text', 'main_content', 'hospital_info',
+    'status_code', 'depth', 'last_modified', 'error'
+})
+
+
 class DatabaseManager:
     """Veritabanı işlemlerini yöneten sınıf"""
     
     def __init__(self):
         """DatabaseManager sınıfını başlat"""
         self.engine = create_async_engine(ASYNC_DATABASE_URL)
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine.sync_engine, 'connect', _set_sqlite_pragmas)
         self.session_maker = sessionmaker(
             bind=self.engine, 
             class_=AsyncSession, 
-            expire_on_commit=False
+            expire_on_commit=False,
+            autoflush=False  # Yazmalar açıkça flush/commit edilir; sorgular öncesinde otomatik flush yapılmaz
         )
         self.current_session_id = None
         
+        # Bağlantılar tek hazırlanmış ifadeyle eklenir; aynı sayfadan aynı hedefe ikinci kayıt atlanır
+        if self.engine.dialect.name == 'sqlite':
+            self._link_insert = sqlite_insert(Link).on_conflict_do_nothing(
+                index_elements=['source_id', 'target_url_hash']
+            )
+        else:
+            self._link_insert = insert(Link)
+        
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[AsyncSession]:
+        """
+        Blok boyunca tek oturum ve tek işlem kullan (save_page/save_links/mark_link_as_crawled
+        çağrıları bu oturumu paylaşır; commit blok sonunda bir kez yapılır)
+        
+        Yields:
+            AsyncSession: Paylaşılan oturum
+        """
+        session = _current_session.get()
+        if session is not None:
+            # İç içe kapsamlar dıştaki işleme katılır
+            yield session
+            return
+        
+        async with self.session_maker() as session:
+            token = _current_session.set(session)
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+            finally:
+                _current_session.reset(token)
+    
+    @asynccontextmanager
+    async def _session_for(self, session: Optional[AsyncSession] = None) -> AsyncIterator[Tuple[AsyncSession, bool]]:
+        """
+        Verilen veya etkin (session_scope) oturumu kullan, yoksa yeni oturum aç
+        
+        Yields:
+            Tuple[AsyncSession, bool]: (oturum, commit/rollback sorumluluğu çağıranda mı)
+        """
+        session = session or _current_session.get()
+        if session is not None:
+            yield session, False
+            return
+        
+        async with self.session_maker() as session:
+            yield session, True
+    
     async def init_db(self):
         """Veritabanını başlat ve tabloları oluştur"""
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_and_migrate)
             logger.info("Veritabanı tabloları oluşturuldu")
     
     async def start_crawl_session(self, base_url: str, config: Dict[str, Any] = None) -> int:
@@ -81,27 +318,27 @@ class DatabaseManager:
     
     async def end_crawl_session(self, session_id: int, status: str = 'completed') -> None:
         """Tarama oturumunu sonlandır"""
+        # Durum, bitiş zamanı ve taranan sayfa sayısı tek UPDATE ile güncellenir;
+        # alt sorgu güncellenen oturumun start_time değerine bağlıdır (SQL içinde karşılaştırılır)
+        pages_count = (
+            select(func.count())
+            .select_from(Page)
+            .where(Page.crawled_at >= CrawlSession.start_time)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(CrawlSession)
+            .where(CrawlSession.id == session_id)
+            .values(status=status, end_time=func.now(), pages_crawled=pages_count)
+        )
         async with self.session_maker() as session:
-            stmt = future_select(CrawlSession).where(CrawlSession.id == session_id)
             result = await session.execute(stmt)
-            crawl_session = result.scalars().first()
-            
-            if crawl_session:
-                # Tarama oturumunun durumunu ve bitiş zamanını güncelle
-                crawl_session.status = status
-                crawl_session.end_time = func.now()
-                
-                # Taranan sayfa sayısını güncelle
-                pages_count_stmt = select(func.count()).select_from(Page).where(
-                    Page.crawled_at >= crawl_session.start_time
-                )
-                pages_count = await session.execute(pages_count_stmt)
-                crawl_session.pages_crawled = pages_count.scalar()
-                
-                await session.commit()
-                logger.info(f"Tarama oturumu sonlandırıldı: {session_id}, Durum: {status}")
-            else:
-                logger.warning(f"Sonlandırılacak tarama oturumu bulunamadı: {session_id}")
+            await session.commit()
+        
+        if result.rowcount:
+            logger.info(f"Tarama oturumu sonlandırıldı: {session_id}, Durum: {status}")
+        else:
+            logger.warning(f"Sonlandırılacak tarama oturumu bulunamadı: {session_id}")
     
     async def pause_crawl_session(self, session_id: int) -> None:
         """Tarama oturumunu duraklat"""
@@ -117,158 +354,309 @@ class DatabaseManager:
             else:
                 logger.warning(f"Duraklatılacak tarama oturumu bulunamadı: {session_id}")
     
+    async def resume_crawl_session(self, session_id: int) -> None:
+        """Duraklatılmış tarama oturumunu yeniden çalışıyor olarak işaretle (bitiş zamanı temizlenir)"""
+        stmt = (
+            update(CrawlSession)
+            .where(CrawlSession.id == session_id)
+            .values(status='running', end_time=None)
+        )
+        async with self.session_maker() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+        
+        if result.rowcount:
+            logger.info(f"Tarama oturumu devam ettiriliyor: {session_id}")
+        else:
+            logger.warning(f"Devam ettirilecek tarama oturumu bulunamadı: {session_id}")
+    
     @staticmethod
-    def get_url_hash(url: str) -> str:
+    def get_url_hash(url: str) -> bytes:
         """URL için benzersiz bir hash oluştur"""
-        return hashlib.md5(url.encode()).hexdigest()
+        return hash_url(url)
+    
+    @staticmethod
+    def _page_row(page_data: Dict[str, Any], url_hash: bytes) -> Dict[str, Any]:
+        """Sayfa verisini Page sütunlarına karşılık gelen sözlüğe çevir"""
+        return {
+            'url': page_data.get('url'),
+            'url_hash': url_hash,
+            'title': page_data.get('title'),
+            'content_type': page_data.get('content_type'),
+            'full_text': page_data.get('full_text'),
+            'main_content': page_data.get('main_content'),
+            'hospital_info': page_data.get('hospital_info'),
+            'status_code': page_data.get('status_code'),
+            'depth': page_data.get('depth', 0),
+            'last_modified': page_data.get('last_modified'),
+            'error': page_data.get('error')
+        }
+    
+    @staticmethod
+    def _new_page(page_data: Dict[str, Any], url_hash: bytes) -> Page:
+        """Sayfa verisinden yeni bir Page nesnesi oluştur"""
+        return Page(**DatabaseManager._page_row(page_data, url_hash))
+    
+    @staticmethod
+    def _upsert_page_stmt(page_data: Dict[str, Any], url_hash: bytes):
+        """Sayfayı tek sorguda ekleyen veya güncelleyen SQLite INSERT ... ON CONFLICT ifadesi"""
+        # Güncellemede _update_page ile aynı kural: yalnızca gelen alanlar (url/url_hash hariç)
+        updates = {
+            key: value for key, value in page_data.items()
+            if key in _PAGE_UPDATE_COLUMNS
+        }
+        updates['crawled_at'] = func.now()
+        return (
+            sqlite_insert(Page)
+            .values(**DatabaseManager._page_row(page_data, url_hash))
+            .on_conflict_do_update(index_elements=['url_hash'], set_=updates)
+            .returning(Page.id)
+        )
+    
+    @staticmethod
+    def _update_page(page: Page, page_data: Dict[str, Any]) -> None:
+        """Var olan sayfayı yeni verilerle güncelle"""
+        for key, value in page_data.items():
+            if key != 'url' and key != 'url_hash' and hasattr(page, key):
+                setattr(page, key, value)
+        page.crawled_at = func.now()
     
-    async def save_page(self, page_data: Dict[str, Any]) -> Optional[int]:
-        """Taranan sayfayı veritabanına kaydet"""
+    def _link_rows(self, source_page_id: int, links: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bağlantıları toplu ekleme için satır sözlüklerine çevir"""
+        return [
+            {
+                'source_id': source_page_id,
+                'target_url': link_data.get('url'),
+                'target_url_hash': self.get_url_hash(link_data.get('url')),
+                'target_domain': link_data.get('target_domain') or _url_domain(link_data.get('url')),
+                'is_internal': link_data.get('is_internal', True),
+                'is_crawled': link_data.get('is_crawled', False)
+            }
+            for link_data in links
+        ]
+    
+    async def save_page(self, page_data: Dict[str, Any], session: Optional[AsyncSession] = None) -> Optional[int]:
+        """
+        Taranan sayfayı veritabanına kaydet
+        
+        Args:
+            page_data: Sayfa verisi
+            session: Kullanılacak oturum (verilmezse etkin session_scope veya yeni bir oturum)
+        
+        Returns:
+            Optional[int]: Sayfanın ID'si, hata durumunda None
+        """
         url = page_data.get('url')
         url_hash = self.get_url_hash(url)
         
-        async with self.session_maker() as session:
-            # Sayfa daha önce kaydedilmiş mi kontrol et
-            stmt = future_select(Page).where(Page.url_hash == url_hash)
-            result = await session.execute(stmt)
-            existing_page = result.scalars().first()
-            
-            if existing_page:
-                # Sayfa zaten var, sadece güncellenebilir
-                for key, value in page_data.items():
-                    if key != 'url' and key != 'url_hash' and hasattr(existing_page, key):
-                        setattr(existing_page, key, value)
+        async with self._session_for(session) as (session, owned):
+            try:
+                if self.engine.dialect.name == 'sqlite':
+                    # Tek gidiş-dönüş: önce SELECT yapılmaz, çakışmada satır yerinde güncellenir
+                    result = await session.execute(self._upsert_page_stmt(page_data, url_hash))
+                    page_id = result.scalar()
+                else:
+                    page_id = await self._save_page_orm(session, page_data, url_hash)
                 
-                existing_page.crawled_at = func.now()
-                try:
+                if owned:
                     await session.commit()
-                    return existing_page.id
-                except Exception as e:
-                    await session.rollback()
-                    logger.error(f"Sayfa güncellenirken hata: {str(e)}")
-                    return None
-            
-            # Yeni sayfa ekle
-            new_page = Page(
-                url=url,
-                url_hash=url_hash,
-                title=page_data.get('title'),
-                content_type=page_data.get('content_type'),
-                full_text=page_data.get('full_text'),
-                main_content=page_data.get('main_content'),
-                hospital_info=page_data.get('hospital_info'),
-                status_code=page_data.get('status_code'),
-                depth=page_data.get('depth', 0),
-                last_modified=page_data.get('last_modified'),
-                error=page_data.get('error')
-            )
-            
-            try:
-                session.add(new_page)
-                await session.commit()
-                return new_page.id
-            except IntegrityError:
-                await session.rollback()
-                logger.warning(f"Sayfa zaten mevcut: {url}")
-                # Yeniden sorgula ve ID'yi döndür
-                stmt = future_select(Page).where(Page.url_hash == url_hash)
-                result = await session.execute(stmt)
-                existing_page = result.scalars().first()
-                return existing_page.id if existing_page else None
+                return page_id
             except Exception as e:
-                await session.rollback()
+                if owned:
+                    await session.rollback()
                 logger.error(f"Sayfa kaydedilirken hata: {str(e)}")
                 return None
     
-    async def save_links(self, source_page_id: int, links: List[Dict[str, Any]]) -> None:
-        """Bir sayfadan çıkarılan bağlantıları veritabanına kaydet"""
-        async with self.session_maker() as session:
+    async def _save_page_orm(self, session: AsyncSession, page_data: Dict[str, Any], url_hash: bytes) -> Optional[int]:
+        """SQLite dışındaki veritabanları için SELECT ardından ekleme/güncelleme ile sayfa kaydı"""
+        # Sayfa daha önce kaydedilmiş mi kontrol et
+        stmt = future_select(Page).where(Page.url_hash == url_hash)
+        result = await session.execute(stmt)
+        existing_page = result.scalars().first()
+        
+        if existing_page:
+            # Sayfa zaten var, sadece güncellenebilir
+            self._update_page(existing_page, page_data)
+            await session.flush()
+            return existing_page.id
+        
+        # Yeni sayfa ekle (savepoint: çakışmada paylaşılan işlemin geri kalanı korunur)
+        new_page = self._new_page(page_data, url_hash)
+        try:
+            async with session.begin_nested():
+                session.add(new_page)
+            return new_page.id
+        except IntegrityError:
+            logger.warning(f"Sayfa zaten mevcut: {page_data.get('url')}")
+            # Yeniden sorgula ve ID'yi döndür
+            result = await session.execute(stmt)
+            existing_page = result.scalars().first()
+            return existing_page.id if existing_page else None
+    
+    async def save_links(self, source_page_id: int, links: List[Dict[str, Any]],
+                         session: Optional[AsyncSession] = None) -> None:
+        """
+        Bir sayfadan çıkarılan bağlantıları veritabanına kaydet
+        
+        Args:
+            source_page_id: Kaynak sayfanın ID'si
+            links: Bağlantı listesi
+            session: Kullanılacak oturum (verilmezse etkin session_scope veya yeni bir oturum)
+        """
+        async with self._session_for(session) as (session, owned):
             # Toplu işlem için
             try:
                 for i in range(0, len(links), BATCH_SIZE):
-                    batch = links[i:i+BATCH_SIZE]
-                    link_objects = []
-                    
-                    for link_data in batch:
-                        target_url = link_data.get('url')
-                        target_url_hash = self.get_url_hash(target_url)
-                        
-                        # Bağlantı nesnesini oluştur
-                        link_obj = Link(
-                            source_id=source_page_id,
-                            target_url=target_url,
-                            target_url_hash=target_url_hash,
-                            is_internal=link_data.get('is_internal', True),
-                            is_crawled=link_data.get('is_crawled', False)
-                        )
-                        link_objects.append(link_obj)
+                    # ORM nesneleri yerine satır sözlükleri (tek executemany çağrısı için)
+                    rows = self._link_rows(source_page_id, links[i:i+BATCH_SIZE])
                     
                     # Toplu işlemi gerçekleştir
-                    if link_objects:
-                        session.add_all(link_objects)
-                        await session.commit()
+                    if rows:
+                        await session.execute(self._link_insert, rows)
                 
+                # Tüm gruplar tek bir işlemde yazılır
+                if owned:
+                    await session.commit()
                 logger.info(f"Toplam {len(links)} bağlantı veritabanına kaydedildi")
             except Exception as e:
-                await session.rollback()
+                if owned:
+                    await session.rollback()
                 logger.error(f"Bağlantılar kaydedilirken hata: {str(e)}")
     
+    async def save_pages_bulk(self, entries: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]) -> int:
+        """
+        Birden fazla sayfayı ve bağlantılarını tek bir veritabanı işleminde kaydet
+        
+        Args:
+            entries: (sayfa verisi, bağlantı listesi) ikilileri
+        
+        Returns:
+            int: Kaydedilen sayfa sayısı
+        """
+        # Aynı URL birden fazla kez geldiyse son gelen geçerlidir
+        by_hash = {}
+        for page_data, links in entries:
+            by_hash[self.get_url_hash(page_data.get('url'))] = (page_data, links)
+        
+        if not by_hash:
+            return 0
+        
+        pages_table = Page.__table__
+        async with self.session_maker() as session:
+            try:
+                # Var olan sayfaların yalnızca ID'leri tek sorguda getirilir (metin sütunları yüklenmez)
+                stmt = select(Page.url_hash, Page.id).where(Page.url_hash.in_(list(by_hash)))
+                page_ids = dict((await session.execute(stmt)).all())
+                existing = set(page_ids)
+                
+                # Yeni sayfalar tek executemany INSERT ... RETURNING ile eklenir
+                new_rows = [
+                    self._page_row(page_data, url_hash)
+                    for url_hash, (page_data, _) in by_hash.items()
+                    if url_hash not in existing
+                ]
+                if new_rows:
+                    result = await session.execute(
+                        insert(pages_table).returning(pages_table.c.url_hash, pages_table.c.id),
+                        new_rows
+                    )
+                    page_ids.update(result.all())
+                
+                # Var olan sayfalar, gelen alanlara göre gruplanıp grup başına tek executemany UPDATE ile güncellenir
+                # (_update_page ile aynı kural: yalnızca gelen alanlar değişir)
+                updates_by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+                for url_hash, (page_data, _) in by_hash.items():
+                    if url_hash not in existing:
+                        continue
+                    columns = tuple(sorted(key for key in page_data if key in _PAGE_UPDATE_COLUMNS))
+                    row = {f'b_{key}': page_data[key] for key in columns}
+                    row['b_id'] = page_ids[url_hash]
+                    updates_by_columns.setdefault(columns, []).append(row)
+                for columns, rows in updates_by_columns.items():
+                    stmt = (
+                        pages_table.update()
+                        .where(pages_table.c.id == bindparam('b_id'))
+                        .values(crawled_at=func.now(), **{key: bindparam(f'b_{key}') for key in columns})
+                    )
+                    await session.execute(stmt, rows)
+                
+                rows = []
+                for url_hash, (_, links) in by_hash.items():
+                    rows.extend(self._link_rows(page_ids[url_hash], links))
+                for i in range(0, len(rows), BATCH_SIZE):
+                    await session.execute(self._link_insert, rows[i:i+BATCH_SIZE])
+                
+                await session.commit()
+                logger.info(f"{len(by_hash)} sayfa ve {len(rows)} bağlantı veritabanına kaydedildi")
+                return len(by_hash)
+            
+            except IntegrityError:
+                await session.rollback()
+                logger.warning("Toplu sayfa kaydında çakışma, sayfalar tek tek kaydediliyor")
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Sayfalar toplu kaydedilirken hata: {str(e)}")
+                return 0
+        
+        # Çakışma durumunda tek tek kaydet
+        saved = 0
+        for page_data, links in by_hash.values():
+            page_id = await self.save_page(page_data)
+            if not page_id:
+                logger.error(f"Sayfa kaydedilemedi: {page_data.get('url')}")
+                continue
+            saved += 1
+            if links:
+                await self.save_links(page_id, links)
+        return saved
+    
     async def get_uncrawled_links(self, base_url: str, limit: int = 100) -> List[str]:
         """Taranmamış bağlantıları getir"""
         base_domain = urlparse(base_url).netloc
         
         async with self.session_maker() as session:
-            # İç bağlantılardan taranmamış olanları seç
+            # İç bağlantılardan taranmamış ve base_url ile aynı domain'e ait olanları seç
+            # (is_crawled sabitle karşılaştırılır; SQLite kısmi idx_uncrawled indeksini ancak böyle kullanır)
             stmt = future_select(Link.target_url).where(
                 and_(
                     Link.is_internal == True,
-                    Link.is_crawled == False
+                    Link.is_crawled == false(),
+                    Link.target_domain == base_domain
                 )
             ).limit(limit)
             
             result = await session.execute(stmt)
-            links = result.scalars().all()
-            
-            # Sadece base_url ile aynı domain'e ait olanları filtrele
-            filtered_links = [
-                link for link in links 
-                if urlparse(link).netloc == base_domain
-            ]
-            
-            return filtered_links
+            return list(result.scalars().all())
     
-    async def mark_link_as_crawled(self, url: str) -> None:
-        """Bir bağlantıyı taranmış olarak işaretle"""
+    async def mark_link_as_crawled(self, url: str, session: Optional[AsyncSession] = None) -> None:
+        """
+        Bir bağlantıyı taranmış olarak işaretle
+        
+        Args:
+            url: Bağlantının hedef URL'si
+            session: Kullanılacak oturum (verilmezse etkin session_scope veya yeni bir oturum)
+        """
         url_hash = self.get_url_hash(url)
         
-        async with self.session_maker() as session:
-            stmt = future_select(Link).where(Link.target_url_hash == url_hash)
-            result = await session.execute(stmt)
-            links = result.scalars().all()
-            
-            for link in links:
-                link.is_crawled = True
+        async with self._session_for(session) as (session, owned):
+            # ORM nesneleri yüklenmeden tek UPDATE ile işaretle
+            stmt = update(Link).where(Link.target_url_hash == url_hash).values(is_crawled=True)
+            await session.execute(stmt)
             
-            await session.commit()
+            if owned:
+                await session.commit()
     
     async def url_exists(self, url: str) -> bool:
         """URL veritabanında kayıtlı mı kontrol et"""
         url_hash = self.get_url_hash(url)
         
         async with self.session_maker() as session:
-            # Hem sayfalar hem de bağlantılar arasında kontrol et
-            page_stmt = future_select(Page).where(Page.url_hash == url_hash)
-            page_result = await session.execute(page_stmt)
-            page_exists = page_result.scalars().first() is not None
-            
-            if page_exists:
-                return True
-            
-            link_stmt = future_select(Link).where(Link.target_url_hash == url_hash)
-            link_result = await session.execute(link_stmt)
-            link_exists = link_result.scalars().first() is not None
-            
-            return link_exists
+            # Sayfalar ve bağlantılar tek sorguda kontrol edilir (EXISTS ... OR EXISTS ..., kısa devre)
+            stmt = future_select(or_(
+                exists().where(Page.url_hash == url_hash),
+                exists().where(Link.target_url_hash == url_hash)
+            ))
+            return bool(await session.scalar(stmt))
     
     async def get_crawl_stats(self, session_id: Optional[int] = None) -> Dict[str, Any]:
         """Tarama istatistiklerini getir"""
@@ -317,4 +705,11 @@ class DatabaseManager:
     
     async def close(self):
         """Veritabanı bağlantısını kapat"""
-        await self.engine.dispose()
\ No newline at end of file
+        await self.engine.dispose()
+    
+    async def __aenter__(self) -> 'DatabaseManager':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # Bağlantı havuzu her çıkış yolunda (hata ve iptal dahil) kapatılır
+        await self.close()
\ No newline at end of file
@@ -1,10 +1,9 @@
 """
 Veritabanı modelleri ve ORM tanımlamaları
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, LargeBinary, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
-import datetime
 
 Base = declarative_base()
 
@@ -14,7 +13,7 @@ class Page(Base):
     
     id = Column(Integer, primary_key=True)
     url = Column(String(1024), unique=True, nullable=False)
-    url_hash = Column(String(32), unique=True, nullable=False, index=True)
+    url_hash = Column(LargeBinary(16), unique=True, nullable=False, index=True)  # blake2b-128 ham bayt
     title = Column(String(512), nullable=True)
     content_type = Column(String(64), nullable=True)
     full_text = Column(Text, nullable=True)
@@ -22,7 +21,7 @@ class Page(Base):
     hospital_info = Column(Text, nullable=True)
     status_code = Column(Integer, nullable=True)
     depth = Column(Integer, nullable=False, default=0)
-    crawled_at = Column(DateTime, default=datetime.datetime.utcnow)
+    crawled_at = Column(DateTime, server_default=func.current_timestamp())  # SQLite tarafından doldurulur (UTC)
     last_modified = Column(DateTime, nullable=True)
     error = Column(Text, nullable=True)
     
@@ -43,16 +42,19 @@ class Link(Base):
     id = Column(Integer, primary_key=True)
     source_id = Column(Integer, ForeignKey('pages.id'), nullable=False)
     target_url = Column(String(1024), nullable=False)
-    target_url_hash = Column(String(32), nullable=False)
+    target_url_hash = Column(LargeBinary(16), nullable=False)
+    target_domain = Column(String(255), nullable=True)  # Kayıt sırasında bir kez çıkarılır
     is_internal = Column(Boolean, default=True)
     is_crawled = Column(Boolean, default=False)
-    discovered_at = Column(DateTime, default=datetime.datetime.utcnow)
+    discovered_at = Column(DateTime, server_default=func.current_timestamp())
     
     # İndexler
     __table_args__ = (
         Index('idx_target_url_hash', target_url_hash),
-        Index('idx_source_target', source_id, target_url_hash),
-        Index('idx_not_crawled', is_crawled),
+        Index('idx_source_target', source_id, target_url_hash, unique=True),  # Aynı sayfadan aynı hedefe tek bağlantı
+        # Kısmi indeks: yalnızca taranmamış bağlantıları içerir (boyutu taranmamış bağlantı sayısıyla orantılı)
+        Index('idx_uncrawled', is_internal, target_domain, sqlite_where=text('is_crawled = 0')),
+        Index('idx_target_domain', target_domain),
     )
     
     def __repr__(self):
@@ -65,7 +67,7 @@ class CrawlSession(Base):
     
     id = Column(Integer, primary_key=True)
     base_url = Column(String(1024), nullable=False)
-    start_time = Column(DateTime, default=datetime.datetime.utcnow)
+    start_time = Column(DateTime, server_default=func.current_timestamp())
     end_time = Column(DateTime, nullable=True)
     pages_crawled = Column(Integer, default=0)
     status = Column(String(32), default='running')  # running, completed, failed, paused
@@ -14,70 +14,73 @@ from database.db_manager import DatabaseManager
 from crawler.crawler import WebCrawler
 from utils.logger import setup_logger
 from config.settings import (
-    MAX_CONCURRENT_REQUESTS, MAX_PAGES, MAX_DEPTH, VERIFY_SSL, USE_PROXIES, REQUEST_TIMEOUT
+    MAX_CONCURRENT_REQUESTS, MAX_PAGES, MAX_DEPTH, VERIFY_SSL, USE_PROXIES, REQUEST_TIMEOUT,
+    USE_UVLOOP, ASYNCIO_DEBUG
 )
 
 # Global logger
 logger = setup_logger(__name__)
 
-async def run_crawler(args: argparse.Namespace) -> Dict[str, Any]:
+async def _drive(args: argparse.Namespace, method: str) -> Dict[str, Any]:
     """
-    Crawler'ı çalıştır
+    Crawler'ı oluştur, verilen yöntemle taramayı yürüt ve kaynakları her durumda kapat
     
     Args:
         args: Komut satırı argümanları
+        method: Çağrılacak WebCrawler yöntemi ('start' veya 'resume')
     
     Returns:
         Dict[str, Any]: Tarama sonucu
     """
-    logger.info(f"Crawler başlatılıyor: {args.url}")
-    
-    # Veritabanı yöneticisini oluştur
-    db_manager = DatabaseManager()
-    
-    # Crawler'ı oluştur
-    crawler = WebCrawler(
-        base_url=args.url,
-        db_manager=db_manager,
-        max_pages=args.max_pages,
-        max_depth=args.max_depth,
-        concurrency=args.concurrency,
-        timeout=args.timeout,
-        verify_ssl=not args.no_verify_ssl,
-        use_proxies=args.use_proxies
-    )
-    
-    try:
-        # Taramayı başlat
-        await crawler.start()
+    # Veritabanı yöneticisi blok sonunda (her çıkış yolunda) kapatılır
+    async with DatabaseManager() as db_manager:
+        # Crawler'ı oluştur
+        crawler = WebCrawler(
+            base_url=args.url,
+            db_manager=db_manager,
+            max_pages=args.max_pages,
+            max_depth=args.max_depth,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            verify_ssl=not args.no_verify_ssl,
+            use_proxies=args.use_proxies
+        )
         
-        # İstatistikleri al
-        stats = await crawler.get_stats()
+        try:
+            # Taramayı başlat veya devam ettir
+            await getattr(crawler, method)()
+            
+            # İstatistikleri al
+            return await crawler.get_stats()
         
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
+        except KeyboardInterrupt:
+            logger.info("Kullanıcı tarafından durduruldu")
+            # Taramayı duraklat
+            await crawler.pause()
+            
+            # İstatistikleri al
+            return await crawler.get_stats()
         
-        return stats
-    
-    except KeyboardInterrupt:
-        logger.info("Kullanıcı tarafından durduruldu")
-        # Taramayı duraklat
-        await crawler.pause()
+        except Exception as e:
+            logger.error(f"Hata: {str(e)}")
+            return {"error": str(e)}
         
-        # İstatistikleri al
-        stats = await crawler.get_stats()
-        
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
-        
-        return stats
+        finally:
+            # HTTP oturumunu kapat
+            await crawler.close()
+
+async def run_crawler(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Crawler'ı çalıştır
     
-    except Exception as e:
-        logger.error(f"Hata: {str(e)}")
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
-        
-        return {"error": str(e)}
+    Args:
+        args: Komut satırı argümanları
+    
+    Returns:
+        Dict[str, Any]: Tarama sonucu
+    """
+    logger.info(f"Crawler başlatılıyor: {args.url}")
+    return await _drive(args, 'start')
 
 async def resume_crawler(args: argparse.Namespace) -> Dict[str, Any]:
     """
@@ -90,53 +93,19 @@ async def resume_crawler(args: argparse.Namespace) -> Dict[str, Any]:
         Dict[str, Any]: Tarama sonucu
     """
     logger.info(f"Crawler devam ettiriliyor: {args.url}")
+    return await _drive(args, 'resume')
+
+def write_json(path: str, data: Any) -> None:
+    """
+    Veriyi JSON olarak dosyaya yaz (olay döngüsünü bekletmemek için iş parçacığında çağrılır)
     
-    # Veritabanı yöneticisini oluştur
-    db_manager = DatabaseManager()
-    
-    # Crawler'ı oluştur
-    crawler = WebCrawler(
-        base_url=args.url,
-        db_manager=db_manager,
-        max_pages=args.max_pages,
-        max_depth=args.max_depth,
-        concurrency=args.concurrency,
-        timeout=args.timeout,
-        verify_ssl=not args.no_verify_ssl,
-        use_proxies=args.use_proxies
-    )
-    
-    try:
-        # Taramayı devam ettir
-        await crawler.resume()
-        
-        # İstatistikleri al
-        stats = await crawler.get_stats()
-        
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
-        
-        return stats
-    
-    except KeyboardInterrupt:
-        logger.info("Kullanıcı tarafından durduruldu")
-        # Taramayı duraklat
-        await crawler.pause()
-        
-        # İstatistikleri al
-        stats = await crawler.get_stats()
-        
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
-        
-        return stats
-    
-    except Exception as e:
-        logger.error(f"Hata: {str(e)}")
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
-        
-        return {"error": str(e)}
+    Args:
+        path: Çıktı dosyasının yolu
+        data: Yazılacak veri
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
 
 def parse_arguments() -> argparse.Namespace:
     """
@@ -200,19 +169,15 @@ async def main() -> None:
         result = await resume_crawler(args)
     
     elif args.command == "stats":
-        # Veritabanı yöneticisini oluştur
-        db_manager = DatabaseManager()
-        # İstatistikleri al
-        result = await db_manager.get_crawl_stats()
-        # Veritabanı bağlantısını kapat
-        await db_manager.close()
+        # İstatistikleri al (veritabanı bağlantısı blok sonunda kapatılır)
+        async with DatabaseManager() as db_manager:
+            result = await db_manager.get_crawl_stats()
     
     # Sonuçları göster
     if result:
         if args.output:
-            # JSON formatında dosyaya yaz
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            # JSON formatında dosyaya yaz (disk yazımı olay döngüsünün dışında yapılır)
+            await asyncio.to_thread(write_json, args.output, result)
             logger.info(f"Sonuçlar dosyaya yazıldı: {args.output}")
         else:
             # Sonuçları ekrana yazdır
@@ -222,6 +187,13 @@ if __name__ == "__main__":
     # Windows'ta asyncio event loop politikasını ayarla
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    
-    # Ana fonksiyonu çalıştır
-    asyncio.run(main())
\ No newline at end of file
+    elif USE_UVLOOP:
+        # uvloop (libuv tabanlı) kuruluysa varsayılan döngünün yerine kullan
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            logger.debug("uvloop bulunamadı, standart asyncio döngüsü kullanılıyor")
+    
+    # Ana fonksiyonu çalıştır (PYTHONASYNCIODEBUG ortam değişkeni yerine ayar belirleyici)
+    asyncio.run(main(), debug=ASYNCIO_DEBUG)
\ No newline at end of file
@@ -2,13 +2,129 @@
 Web sayfalarından içerik çıkarma işlemleri
 """
 import logging
-from typing import Dict, Any, Optional, Tuple
-from bs4 import BeautifulSoup
+import re
+from functools import partial
+from typing import Dict, Any, Callable, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
 
-from config.settings import MAIN_CONTENT_SELECTOR, HOSPITAL_INFO_SELECTOR
+import soupsieve
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+
+from config.settings import MAIN_CONTENT_SELECTOR, HOSPITAL_INFO_SELECTOR, HTML_PARSER
 
 logger = logging.getLogger(__name__)
 
+
+def _resolve_bs4_parser(name: str) -> str:
+    """
+    İstenen BeautifulSoup ayrıştırıcısı kurulu değilse saf Python html.parser'a geri dön
+    
+    Args:
+        name: Ayrıştırıcı adı (lxml, html5lib, html.parser, ...)
+    
+    Returns:
+        str: Kullanılabilir ayrıştırıcı adı
+    """
+    try:
+        BeautifulSoup('', name)
+        return name
+    except FeatureNotFound:
+        logger.warning(f"'{name}' ayrıştırıcısı bulunamadı, html.parser kullanılacak (çok daha yavaş)")
+        return 'html.parser'
+
+
+# HTML_PARSER=lexbor, HTMLExtractor'da selectolax yolunu seçer; BeautifulSoup'a düşülen durumlarda lxml kullanılır
+BS4_PARSER = _resolve_bs4_parser('lxml' if HTML_PARSER == 'lexbor' else HTML_PARSER)
+
+# urljoin'in ana URL'nin alan adını koruduğu göreli bağlantılar ('/yol', '?sorgu', 'yol' — '//' ile başlayanlar hariç);
+# urlsplit'in sildiği sekme/satır sonu karakterleri '//' oluşturabileceğinden '/' ardından kabul edilmez
+_SAME_HOST_HREF_RE = re.compile(r'/(?![/\\\t\r\n])|\?|[\w.~%-][^:]*\Z')
+
+
+def is_internal_link(href: str, full_url: str, base_netloc: str) -> bool:
+    """
+    Bağlantının sayfayla aynı alan adına gidip gitmediğini kontrol et (göreli bağlantılarda URL ayrıştırılmaz)
+    
+    Args:
+        href: Sayfadaki ham href değeri
+        full_url: href'in ana URL'ye göre çözülmüş hali
+        base_netloc: Sayfa URL'sinin alan adı
+    
+    Returns:
+        bool: Aynı alan adındaysa True
+    """
+    if _SAME_HOST_HREF_RE.match(href):
+        return True
+    return urlparse(full_url).netloc == base_netloc
+
+
+# Nokta segmenti, boş sorgu/parça, ';' parametresi veya urlsplit'in sildiği karakterleri içermeyen
+# mutlak yollar ('/yol/sayfa?a=1'); bunlarda urljoin sonucu sayfanın kökü ile yolun birleşimidir
+_PLAIN_ABS_PATH_RE = re.compile(r'/(?![/.])[^/\\\t\r\n;?#]*(?:/(?![.])[^/\\\t\r\n;?#]*)*(?:\?[^\t\r\n#]+)?')
+
+
+def url_origin(base_url: str) -> Optional[str]:
+    """
+    Sayfa URL'sinin 'şema://alan_adı' kökünü döndür (join_href için sayfa başına bir kez hesaplanır)
+    
+    Args:
+        base_url: Sayfanın URL'si
+    
+    Returns:
+        Optional[str]: Kök; http(s) dışı veya alan adı olmayan URL'lerde None
+    """
+    parsed = urlparse(base_url)
+    if parsed.scheme in ('http', 'https') and parsed.netloc:
+        return f"{parsed.scheme}://{parsed.netloc}"
+    return None
+
+
+def join_href(base_url: str, origin: Optional[str], href: str) -> str:
+    """
+    href'i sayfa URL'sine göre çöz; sade mutlak yollar urljoin'e girmeden birleştirilir
+    
+    Args:
+        base_url: Sayfanın URL'si
+        origin: url_origin(base_url) sonucu
+        href: Sayfadaki ham href/src değeri
+    
+    Returns:
+        str: urljoin(base_url, href) ile aynı sonuç
+    """
+    if origin is not None and _PLAIN_ABS_PATH_RE.fullmatch(href):
+        return origin + href
+    return urljoin(base_url, href)
+
+
+# Sadece tek bir id içeren seçiciler ("#header-middle-content" gibi)
+_ID_SELECTOR_RE = re.compile(r'#(-?[A-Za-z_][\w-]*)')
+
+
+def _find_by_id(soup: BeautifulSoup, element_id: str) -> Optional[Tag]:
+    """id ile eleman bul (CSS seçici motorunu kullanmadan)"""
+    return soup.find(id=element_id)
+
+
+def _compile_selector(selector: Optional[str]) -> Optional[Callable[[BeautifulSoup], Optional[Tag]]]:
+    """
+    CSS seçiciyi bir kez derle
+    
+    Args:
+        selector: CSS seçici
+    
+    Returns:
+        Optional[Callable]: Soup alıp ilk eşleşen elemanı döndüren fonksiyon veya seçici yoksa None
+    """
+    if not selector:
+        return None
+    
+    match = _ID_SELECTOR_RE.fullmatch(selector)
+    if match:
+        return partial(_find_by_id, element_id=match.group(1))
+    
+    return soupsieve.compile(selector).select_one
+
+
 class ContentExtractor:
     """Web sayfalarından içerik çıkarmak için temel sınıf"""
     
@@ -23,48 +139,41 @@ class ContentExtractor:
         """
         self.main_content_selector = main_content_selector
         self.hospital_info_selector = hospital_info_selector
+        
+        # Seçiciler her sayfada yeniden ayrıştırılmasın diye bir kez derlenir
+        self._select_main_content = _compile_selector(main_content_selector)
+        self._select_hospital_info = _compile_selector(hospital_info_selector)
     
-    def extract_content(self, html: str, url: str) -> Dict[str, Any]:
+    @staticmethod
+    def _parse(html: Union[str, bytes], encoding: Optional[str] = None) -> BeautifulSoup:
+        """
+        HTML'i ayrıştır; ham bayt verildiyse metne çevirme işini ayrıştırıcıya bırak
+        
+        Args:
+            html: HTML içeriği (metin ya da ham bayt)
+            encoding: Ham bayt için karakter kodlaması (None ise belge içinden tespit edilir)
+        
+        Returns:
+            BeautifulSoup: Ayrıştırılmış belge
+        """
+        if isinstance(html, bytes):
+            return BeautifulSoup(html, BS4_PARSER, from_encoding=encoding)
+        return BeautifulSoup(html, BS4_PARSER)
+    
+    def extract_content(self, html: Union[str, bytes], url: str, encoding: Optional[str] = None) -> Dict[str, Any]:
         """
         HTML içeriğinden metinleri çıkar
         
         Args:
-            html: HTML içeriği
+            html: HTML içeriği (metin ya da ham bayt)
             url: Sayfanın URL'si
+            encoding: Ham bayt için karakter kodlaması
         
         Returns:
             Dict[str, Any]: Çıkarılan içerik
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Script ve stil içeriklerini kaldır
-            for script_or_style in soup(['script', 'style', 'noscript', 'iframe']):
-                script_or_style.decompose()
-            
-            # Sayfa başlığını al
-            title = None
-            title_tag = soup.find('title')
-            if title_tag:
-                title = title_tag.get_text(strip=True)
-            
-            # Ana içeriği ve hastane bilgisini al
-            main_content, hospital_info = self._extract_specific_content(soup)
-            
-            # Tüm metni al
-            full_text = soup.get_text(separator='\n', strip=False)
-            
-            # Bağlantıları çıkar
-            links = self._extract_links(soup, url)
-            
-            return {
-                'title': title,
-                'full_text': full_text,
-                'main_content': main_content,
-                'hospital_info': hospital_info,
-                'links': links,
-                'url': url
-            }
+            return self._extract_from_soup(self._parse(html, encoding), url)
         
         except Exception as e:
             logger.error(f"İçerik çıkarma hatası ({url}): {str(e)}")
@@ -78,6 +187,45 @@ class ContentExtractor:
                 'error': str(e)
             }
 
+    
+    def _extract_from_soup(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        """
+        Ayrıştırılmış belgeden metinleri çıkar (belge yerinde değiştirilir: script/stil etiketleri silinir)
+        
+        Args:
+            soup: BeautifulSoup nesnesi
+            url: Sayfanın URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        # Script ve stil içeriklerini kaldır
+        for script_or_style in soup(['script', 'style', 'noscript', 'iframe']):
+            script_or_style.decompose()
+        
+        # Sayfa başlığını al
+        title = None
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+        
+        # Ana içeriği ve hastane bilgisini al
+        main_content, hospital_info = self._extract_specific_content(soup)
+        
+        # Tüm metni al
+        full_text = soup.get_text(separator='\n', strip=False)
+        
+        # Bağlantıları çıkar
+        links = self._extract_links(soup, url)
+        
+        return {
+            'title': title,
+            'full_text': full_text,
+            'main_content': main_content,
+            'hospital_info': hospital_info,
+            'links': links,
+            'url': url
+        }
                 
     def _extract_specific_content(self, soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -87,33 +235,31 @@ class ContentExtractor:
         hospital_info = None
         
         # Ana içeriği çıkar
-        if self.main_content_selector:
-            main_content_element = soup.select_one(self.main_content_selector)
-            if main_content_element:
-                # HTML içindeki metin düğümlerini topla ve aralarında boşluk bırak
-                texts = []
-                for elem in main_content_element.find_all(text=True):
-                    if elem.strip():
-                        texts.append(elem.strip())
-                
-                # Metin parçalarını birleştir, ancak boşluk ekleyerek
-                main_content = " ".join(texts)
+        if self._select_main_content:
+            main_content = self._text_of(self._select_main_content(soup))
         
         # Hastane bilgisini çıkar
-        if self.hospital_info_selector:
-            hospital_info_element = soup.select_one(self.hospital_info_selector)
-            if hospital_info_element:
-                # HTML içindeki metin düğümlerini topla ve aralarında boşluk bırak
-                texts = []
-                for elem in hospital_info_element.find_all(text=True):
-                    if elem.strip():
-                        texts.append(elem.strip())
-                
-                # Metin parçalarını birleştir, ancak boşluk ekleyerek
-                hospital_info = " ".join(texts)
+        if self._select_hospital_info:
+            hospital_info = self._text_of(self._select_hospital_info(soup))
         
         return main_content, hospital_info
     
+    @staticmethod
+    def _text_of(element: Optional[Tag]) -> Optional[str]:
+        """
+        Elemandaki metin düğümlerini tek geçişte kırp ve aralarında boşlukla birleştir
+        
+        Args:
+            element: Metni alınacak eleman
+        
+        Returns:
+            Optional[str]: Birleştirilmiş metin veya eleman yoksa None
+        """
+        if element is None:
+            return None
+        # Yalnızca boşluktan oluşan düğümler atlanır; kelimeler birleşmez
+        return element.get_text(separator=' ', strip=True)
+    
     @staticmethod
     def _extract_links(soup: BeautifulSoup, base_url: str) -> list:
         """
@@ -126,26 +272,31 @@ class ContentExtractor:
         Returns:
             list: Bağlantı listesi
         """
-        from urllib.parse import urljoin, urlparse
-        
         links = []
+        base_netloc = urlparse(base_url).netloc
+        origin = url_origin(base_url)
+        # Menülerde tekrar eden bağlantılar bir kez döndürülür (ilk geçtiği yerdeki metinle)
+        seen = set()
         
         # Tüm <a> etiketlerini işle
         for a_tag in soup.find_all('a', href=True):
-            href = a_tag.get('href', '')#.strip()
+            href = a_tag.attrs.get('href', '')  # find_all(href=True) olduğu için her zaman vardır
             
             # Boş veya javascript bağlantılarını atla
             if not href or href.startswith('javascript:') or href.startswith('#'):
                 continue
             
             # Tam URL oluştur
-            full_url = urljoin(base_url, href)
+            full_url = join_href(base_url, origin, href)
+            if full_url in seen:
+                continue
+            seen.add(full_url)
             
             # İç veya dış bağlantı mı kontrol et
-            is_internal = urlparse(base_url).netloc == urlparse(full_url).netloc
+            is_internal = is_internal_link(href, full_url, base_netloc)
             
             # Bağlantı metnini al
-            link_text = a_tag.get_text(strip=False)
+            link_text = ''.join(a_tag.strings)  # get_text(strip=False) ile aynı, ayırıcı işlemi olmadan
             
             links.append({
                 'url': full_url,
@@ -1,40 +1,66 @@
 """
 HTML içeriklerini işlemek için genişletilmiş fonksiyonlar
 """
+import codecs
+import json
 import logging
 import re
-from typing import Dict, Any, List, Tuple, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Tuple, Optional, Union
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, SoupStrainer
 
-from scraper.content_extractor import ContentExtractor
-from config.settings import MAIN_CONTENT_SELECTOR, HOSPITAL_INFO_SELECTOR
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax isteğe bağlıdır (HTML_PARSER=lexbor)
+    LexborHTMLParser = None
+
+try:
+    import orjson
+except ImportError:  # orjson isteğe bağlıdır
+    orjson = None
+
+from scraper.content_extractor import BS4_PARSER, ContentExtractor, is_internal_link, join_href, url_origin
+from config.settings import MAIN_CONTENT_SELECTOR, HOSPITAL_INFO_SELECTOR, HTML_PARSER
 
 logger = logging.getLogger(__name__)
 
-import re
+# HTMLExtractor.clean_text desenleri (sayfa başına üç kez çağrılır; bir kez derlenir)
+_TAG_RE = re.compile(r'<[^>]+>')
+_VERSION_MARKER_RE = re.compile(r'#\d+ *anahlı dal içerik başlıyor: *\[versiyon *: *\d+\]')
+_BRANCH_MARKER_RE = re.compile(r'#+ *\d+ *anahlı dal içerik (başlıyor|bitti) *#+')
+_SITE_TREE_RE = re.compile(r'SiteAgacDallar:[\d\.]+')
+_LAYOUT_CLASS_RE = re.compile(r'container|page-content-(header|body|footer)')
+_TITLE_ABBR_RE = re.compile(r'(Dr|Uzm|Prof|Doç)\.\s*([A-ZÇĞİÖŞÜ])')
+_CAMEL_RE = re.compile(r'([a-zçğıöşü])([A-ZÇĞİÖŞÜ])')
+_MULTI_SPACE_RE = re.compile(r'\s{2,}')
 
-def clean_text(self, text: str) -> str:
-    """
-    Metni temizle ancak kelime aralarındaki boşlukları koru
+_HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Yapılandırılmış veriler yalnızca meta ve script etiketlerindedir; gövdenin geri kalanı ağaca alınmaz
+# (JSON-LD <body> içinde de bulunabildiğinden yalnızca <head> ayrıştırılmaz)
+_STRUCTURED_DATA_STRAINER = SoupStrainer(['meta', 'script'])
+_OG_PROPERTY_RE = re.compile(r'^og:')
+_TWITTER_NAME_RE = re.compile(r'^twitter:')
+
+
+def _parse_json_ld(text: str) -> Any:
     """
-    if not text:
-        return ""
-    
-    # HTML etiketlerini boşluklarla değiştir (silmek yerine)
-    text = re.sub(r'<[^>]+>', ' ', text)
-    
-    # Satır sonlarını boşluklara dönüştür ama tamamen kaldırma
-    # Bu sayede kelimeler satır sonlarında birleşmeyecek
-    text = text.replace('\n', ' ')
+    JSON-LD bloğunu ayrıştır (orjson kuruluysa onunla)
     
-    # Çoklu boşlukları tek boşluğa indirgeme (isteğe bağlı)
-    # text = re.sub(r'\s{2,}', ' ', text)
+    orjson'un reddettiği girdiler (NaN, 64 bitten büyük tam sayılar) için standart json'a dönülür.
     
-    # Noktalama işaretlerinden sonra boşluk ekleyin
-    # Ama zaten boşluk varsa eklemeyin
-    text = re.sub(r'([.,!?:;])([^\s])', r'\1 \2', text)
+    Args:
+        text: JSON metni
     
-    return text
+    Returns:
+        Any: Ayrıştırılmış veri (geçersiz JSON'da json.JSONDecodeError yükselir)
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
 
 
 class HTMLExtractor(ContentExtractor):
@@ -50,58 +76,156 @@ class HTMLExtractor(ContentExtractor):
             hospital_info_selector: Hastane bilgisini seçmek için CSS seçici
         """
         super().__init__(main_content_selector, hospital_info_selector)
+        
+        # HTML_PARSER=lexbor ise sayfalar selectolax (lexbor) ile işlenir; kurulu değilse BeautifulSoup kullanılır
+        self._use_lexbor = HTML_PARSER == 'lexbor' and LexborHTMLParser is not None
+        if HTML_PARSER == 'lexbor' and LexborHTMLParser is None:
+            logger.warning("HTML_PARSER=lexbor için selectolax kurulu değil, BeautifulSoup (lxml) kullanılacak")
     
-    def extract_content(self, html: str, url: str) -> Dict[str, Any]:
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Script ve stil içeriklerini kaldır
-            for script_or_style in soup(['script', 'style', 'noscript', 'iframe']):
-                script_or_style.decompose()
-            
-            # Sayfa başlığını al
-            title = None
-            title_tag = soup.find('title')
-            if title_tag:
-                title = title_tag.get_text(strip=True)
-            
-            # Ana içeriği ve hastane bilgisini al
-            main_content, hospital_info = self._extract_specific_content(soup)
-            
-            # İçeriği temizle ve düzenle
-            if main_content:
-                main_content = self.clean_text(main_content)
-            
-            if hospital_info:
-                hospital_info = self.clean_text(hospital_info)
-            
-            # Tüm metni al
-            full_text = soup.get_text(separator='\n', strip=True)
-            full_text = self.clean_text(full_text)
+    def extract_content(self, html: Union[str, bytes], url: str, encoding: Optional[str] = None) -> Dict[str, Any]:
+        """
+        HTML içeriğinden metinleri çıkar
+        
+        Args:
+            html: HTML içeriği (metin ya da ham bayt)
+            url: Sayfanın URL'si
+            encoding: Ham bayt için karakter kodlaması
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        # Kodlaması bilinmeyen ham bayt (tespit BeautifulSoup'ta) ve lexbor hataları BeautifulSoup yoluna düşer
+        if self._use_lexbor and (encoding or not isinstance(html, bytes)):
+            try:
+                return self._extract_with_lexbor(html, url, encoding)
+            except Exception as e:
+                logger.debug(f"lexbor ile içerik çıkarılamadı, BeautifulSoup kullanılıyor ({url}): {str(e)}")
+        return super().extract_content(html, url, encoding)
+    
+    def _extract_with_lexbor(self, html: Union[str, bytes], url: str, encoding: Optional[str] = None) -> Dict[str, Any]:
+        """
+        İçeriği selectolax (lexbor) ile çıkar; çıktı _extract_from_soup ile aynı biçimdedir
+        
+        Args:
+            html: HTML içeriği (metin ya da ham bayt)
+            url: Sayfanın URL'si
+            encoding: Ham bayt için karakter kodlaması
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        # lexbor UTF-8 baytları doğrudan (C içinde) çözer; diğer kodlamalar önce metne çevrilir
+        if isinstance(html, bytes) and codecs.lookup(encoding).name != 'utf-8':
+            html = html.decode(encoding, errors='replace')
+        tree = LexborHTMLParser(html)
+        
+        # Script ve stil içeriklerini kaldır
+        tree.strip_tags(['script', 'style', 'noscript', 'iframe'])
+        
+        # Sayfa başlığını al
+        title_node = tree.css_first('title')
+        title = title_node.text(strip=True) if title_node is not None else None
+        
+        # Ana içeriği ve hastane bilgisini al (metin düğümleri aralarında boşlukla birleştirilir)
+        main_content = self._lexbor_text(tree, self.main_content_selector)
+        if main_content:
+            main_content = self.clean_text(main_content)
+        
+        hospital_info = self._lexbor_text(tree, self.hospital_info_selector)
+        if hospital_info:
+            hospital_info = self.clean_text(hospital_info)
+        
+        # Tüm metni al
+        root = tree.root
+        full_text = self.clean_text(root.text(separator='\n', strip=True, skip_empty=True) if root is not None else '')
+        
+        # Bağlantıları çıkar
+        base_netloc = urlparse(url).netloc
+        origin = url_origin(url)
+        links = []
+        seen = set()
+        for a_tag in tree.css('a[href]'):
+            href = a_tag.attributes.get('href')
             
-            # Bağlantıları çıkar
-            links = self._extract_links(soup, url)
+            # Boş veya javascript bağlantılarını atla
+            if not href or href.startswith('javascript:') or href.startswith('#'):
+                continue
             
-            return {
-                'title': title,
-                'full_text': full_text,
-                'main_content': main_content,
-                'hospital_info': hospital_info,
-                'links': links,
-                'url': url
-            }
+            full_url = join_href(url, origin, href)
+            if full_url in seen:
+                continue
+            seen.add(full_url)
+            links.append({
+                'url': full_url,
+                'text': a_tag.text(strip=False),
+                'is_internal': is_internal_link(href, full_url, base_netloc)
+            })
         
-        except Exception as e:
-            logger.error(f"İçerik çıkarma hatası ({url}): {str(e)}")
-            return {
-                'title': None,
-                'full_text': None,
-                'main_content': None,
-                'hospital_info': None,
-                'links': [],
-                'url': url,
-                'error': str(e)
-            }
+        return {
+            'title': title,
+            'full_text': full_text,
+            'main_content': main_content,
+            'hospital_info': hospital_info,
+            'links': links,
+            'url': url
+        }
+    
+    @staticmethod
+    def _lexbor_text(tree, selector: Optional[str]) -> Optional[str]:
+        """Seçiciyle eşleşen ilk elemanın metni (seçici yoksa veya eşleşme yoksa None)"""
+        if not selector:
+            return None
+        node = tree.css_first(selector)
+        if node is None:
+            return None
+        return node.text(separator=' ', strip=True, skip_empty=True)
+    
+    def _extract_from_soup(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+        """
+        Ayrıştırılmış belgeden metinleri çıkar ve temizle
+        
+        Args:
+            soup: BeautifulSoup nesnesi (script/stil etiketleri yerinde silinir)
+            url: Sayfanın URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        # Script ve stil içeriklerini kaldır
+        for script_or_style in soup(['script', 'style', 'noscript', 'iframe']):
+            script_or_style.decompose()
+        
+        # Sayfa başlığını al
+        title = None
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+        
+        # Ana içeriği ve hastane bilgisini al
+        main_content, hospital_info = self._extract_specific_content(soup)
+        
+        # İçeriği temizle ve düzenle
+        if main_content:
+            main_content = self.clean_text(main_content)
+        
+        if hospital_info:
+            hospital_info = self.clean_text(hospital_info)
+        
+        # Tüm metni al
+        full_text = soup.get_text(separator='\n', strip=True)
+        full_text = self.clean_text(full_text)
+        
+        # Bağlantıları çıkar
+        links = self._extract_links(soup, url)
+        
+        return {
+            'title': title,
+            'full_text': full_text,
+            'main_content': main_content,
+            'hospital_info': hospital_info,
+            'links': links,
+            'url': url
+        }
     
     @staticmethod
     def _extract_meta_description(soup: BeautifulSoup) -> Optional[str]:
@@ -144,16 +268,16 @@ class HTMLExtractor(ContentExtractor):
             soup: BeautifulSoup nesnesi
         
         Returns:
-            List[Dict[str, Any]]: Başlık listesi
+            List[Dict[str, Any]]: Başlık listesi (belgedeki sırayla)
         """
-        headings = []
-        for level in range(1, 7):
-            for heading in soup.find_all(f'h{level}'):
-                headings.append({
-                    'level': level,
-                    'text': heading.get_text(strip=False)
-                })
-        return headings
+        # Altı seviye tek ağaç taramasında bulunur
+        return [
+            {
+                'level': int(heading.name[1]),
+                'text': heading.get_text(strip=False)
+            }
+            for heading in soup.find_all(_HEADING_TAGS)
+        ]
     
     @staticmethod
     def _extract_images(soup: BeautifulSoup, base_url: str) -> List[Dict[str, Any]]:
@@ -167,21 +291,22 @@ class HTMLExtractor(ContentExtractor):
         Returns:
             List[Dict[str, Any]]: Görsel listesi
         """
-        from urllib.parse import urljoin
         
         images = []
+        origin = url_origin(base_url)
         for img in soup.find_all('img'):
+            attrs = img.attrs
             # Görsel URL'sini al
-            src = img.get('src', '')
+            src = attrs.get('src', '')
             if not src:
                 continue
             
             # Tam URL oluştur
-            full_url = urljoin(base_url, src)
+            full_url = join_href(base_url, origin, src)
             
             # Görsel meta verilerini al
-            alt_text = img.get('alt', '')
-            title = img.get('title', '')
+            alt_text = attrs.get('alt', '')
+            title = attrs.get('title', '')
             
             images.append({
                 'url': full_url,
@@ -196,57 +321,61 @@ class HTMLExtractor(ContentExtractor):
         if not text:
             return ""
         
-        # HTML etiketlerini kaldır (boşluk bırakarak)
-        text = re.sub(r'<[^>]+>', ' ', text)
+        # HTML etiketlerini kaldır (boşluk bırakarak; get_text çıktısında '<' nadiren bulunur)
+        if '<' in text:
+            text = _TAG_RE.sub(' ', text)
         
-        # Özel içerik işaretleyicilerini kaldır
-        text = re.sub(r'#\d+ *anahlı dal içerik başlıyor: *\[versiyon *: *\d+\]', ' ', text)
-        text = re.sub(r'#+ *\d+ *anahlı dal içerik (başlıyor|bitti) *#+', ' ', text)
+        # Özel içerik işaretleyicilerini kaldır (sabit parçası metinde yoksa desen taranmaz)
+        if 'anahlı dal içerik' in text:
+            text = _VERSION_MARKER_RE.sub(' ', text)
+            text = _BRANCH_MARKER_RE.sub(' ', text)
         
         # Sayfa yapı bilgilerini kaldır
-        text = re.sub(r'SiteAgacDallar:[\d\.]+', ' ', text)
-        text = re.sub(r'container|page-content-(header|body|footer)', ' ', text)
+        if 'SiteAgacDallar:' in text:
+            text = _SITE_TREE_RE.sub(' ', text)
+        if 'container' in text or 'page-content-' in text:
+            text = _LAYOUT_CLASS_RE.sub(' ', text)
         
         # Türkçe unvan kısaltmalarından sonra uygun boşluk bırak
-        text = re.sub(r'(Dr|Uzm|Prof|Doç)\.\s*([A-ZÇĞİÖŞÜ])', r'\1. \2', text)
+        text = _TITLE_ABBR_RE.sub(r'\1. \2', text)
         
         # Büyük harfle başlayan kelimelerden önce boşluk olduğundan emin ol 
         # (ama kısaltmalardan sonra gelenleri etkileme)
-        text = re.sub(r'([a-zçğıöşü])([A-ZÇĞİÖŞÜ])', r'\1 \2', text)
+        text = _CAMEL_RE.sub(r'\1 \2', text)
         
         # Gereksiz boşlukları temizle (ama tamamen kaldırma)
-        text = re.sub(r'\s{2,}', ' ', text)
+        text = _MULTI_SPACE_RE.sub(' ', text)
         
         return text.strip()
-
-
-
-
-    def extract_structured_data(self, html: str) -> Dict[str, Any]:
+    
+    def extract_structured_data(self, html: Union[str, bytes, BeautifulSoup]) -> Dict[str, Any]:
         """
         HTML'deki yapılandırılmış verileri çıkar (JSON-LD, microdata vb.)
         
         Args:
-            html: HTML içeriği
+            html: HTML içeriği ya da önceden ayrıştırılmış belge (aynı belge tekrar ayrıştırılmaz;
+                JSON-LD script etiketlerinde olduğundan extract_content'ten önce çağrılmalıdır)
         
         Returns:
             Dict[str, Any]: Yapılandırılmış veriler
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            if isinstance(html, BeautifulSoup):
+                soup = html
+            else:
+                soup = BeautifulSoup(html, BS4_PARSER, parse_only=_STRUCTURED_DATA_STRAINER)
             structured_data = {}
             
             # JSON-LD verilerini çıkar
             json_ld_scripts = soup.find_all('script', type='application/ld+json')
             if json_ld_scripts:
-                import json
                 json_ld_data = []
                 
                 for script in json_ld_scripts:
                     try:
                         json_content = script.string
                         if json_content:
-                            data = json.loads(json_content)
+                            data = _parse_json_ld(json_content)
                             json_ld_data.append(data)
                     except json.JSONDecodeError:
                         continue
@@ -254,29 +383,23 @@ class HTMLExtractor(ContentExtractor):
                 if json_ld_data:
                     structured_data['json_ld'] = json_ld_data
             
-            # OpenGraph verilerini çıkar
-            og_tags = soup.find_all('meta', property=lambda x: x and x.startswith('og:'))
-            if og_tags:
-                og_data = {}
-                for tag in og_tags:
-                    if 'content' in tag.attrs and 'property' in tag.attrs:
-                        property_name = tag['property'][3:]  # 'og:' kısmını kaldır
-                        og_data[property_name] = tag['content']
-                
-                if og_data:
-                    structured_data['open_graph'] = og_data
+            # OpenGraph verilerini çıkar ('og:' öneki kaldırılır)
+            og_data = {
+                tag.attrs['property'][3:]: tag.attrs['content']
+                for tag in soup.find_all('meta', property=_OG_PROPERTY_RE)
+                if 'content' in tag.attrs
+            }
+            if og_data:
+                structured_data['open_graph'] = og_data
             
-            # Twitter card verilerini çıkar
-            twitter_tags = soup.find_all('meta', attrs={'name': lambda x: x and x.startswith('twitter:')})
-            if twitter_tags:
-                twitter_data = {}
-                for tag in twitter_tags:
-                    if 'content' in tag.attrs and 'name' in tag.attrs:
-                        property_name = tag['name'][8:]  # 'twitter:' kısmını kaldır
-                        twitter_data[property_name] = tag['content']
-                
-                if twitter_data:
-                    structured_data['twitter_card'] = twitter_data
+            # Twitter card verilerini çıkar ('twitter:' öneki kaldırılır)
+            twitter_data = {
+                tag.attrs['name'][8:]: tag.attrs['content']
+                for tag in soup.find_all('meta', attrs={'name': _TWITTER_NAME_RE})
+                if 'content' in tag.attrs
+            }
+            if twitter_data:
+                structured_data['twitter_card'] = twitter_data
             
             return structured_data
             
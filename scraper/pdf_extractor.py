@@ -14,9 +14,9 @@ class PDFExtractor:
         """PDFExtractor sınıfını başlat"""
         pass
     
-    async def extract_text(self, pdf_content: bytes, url: str) -> Dict[str, Any]:
+    def extract_text_sync(self, pdf_content: bytes, url: str) -> Dict[str, Any]:
         """
-        PDF içeriğinden metni çıkar
+        PDF içeriğinden metni çıkar (CPU yoğun; crawler bunu süreç havuzunda çalıştırır)
         
         Args:
             pdf_content: PDF dosyasının içeriği (bytes)
@@ -27,55 +27,119 @@ class PDFExtractor:
         """
         try:
             with fitz.open(stream=pdf_content, filetype="pdf") as doc:
-                # Tüm sayfaları birleştir
-                full_text = ""
-                metadata = {}
-                toc = []
-                structure = []
-                
-                # Meta bilgileri al
-                metadata = self._extract_metadata(doc)
-                
-                # İçindekiler tablosunu al
-                toc = doc.get_toc()
-                
-                # Her sayfanın içeriğini ve yapısını çıkar
-                for page_num, page in enumerate(doc):
-                    # Sayfa metnini al
-                    page_text = page.get_text()
-                    full_text += page_text + "\n\n"
-                    
-                    # Sayfa yapısı hakkında bilgi topla
-                    structure.append({
-                        'page_number': page_num + 1,
-                        'text_length': len(page_text)
-                    })
-                
-                return {
-                    'title': metadata.get('title', None),
-                    'full_text': full_text,
-                    'main_content': full_text,  # PDF'ler için ana içerik tüm metindir
-                    'hospital_info': None,  # PDF'lerde hastane bilgisi belirtilmiyor
-                    'links': [],  # PDF'lerde bağlantı çıkarmıyoruz
-                    'url': url,
-                    'metadata': metadata,
-                    'toc': toc,
-                    'structure': structure,
-                    'content_type': 'application/pdf'
-                }
+                return self._extract_from_doc(doc, url)
+        
+        except Exception as e:
+            logger.error(f"PDF metin çıkarma hatası ({url}): {str(e)}")
+            return self._error_result(url, e)
+    
+    def extract_text_file_sync(self, path: str, url: str) -> Dict[str, Any]:
+        """
+        Diskteki PDF dosyasından metni çıkar (büyük PDF'ler bellekte tutulmaz)
+        
+        Args:
+            path: PDF dosyasının yolu
+            url: PDF'nin URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        try:
+            with fitz.open(path, filetype="pdf") as doc:
+                return self._extract_from_doc(doc, url)
         
         except Exception as e:
             logger.error(f"PDF metin çıkarma hatası ({url}): {str(e)}")
-            return {
-                'title': None,
-                'full_text': None,
-                'main_content': None,
-                'hospital_info': None,
-                'links': [],
-                'url': url,
-                'error': str(e),
-                'content_type': 'application/pdf'
-            }
+            return self._error_result(url, e)
+    
+    async def extract_text(self, pdf_content: bytes, url: str) -> Dict[str, Any]:
+        """
+        PDF içeriğinden metni çıkar (çağıran olay döngüsünde çalışır; bkz. extract_text_sync)
+        
+        Args:
+            pdf_content: PDF dosyasının içeriği (bytes)
+            url: PDF'nin URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        return self.extract_text_sync(pdf_content, url)
+    
+    async def extract_text_file(self, path: str, url: str) -> Dict[str, Any]:
+        """
+        Diskteki PDF dosyasından metni çıkar (çağıran olay döngüsünde çalışır; bkz. extract_text_file_sync)
+        
+        Args:
+            path: PDF dosyasının yolu
+            url: PDF'nin URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        return self.extract_text_file_sync(path, url)
+    
+    def _extract_from_doc(self, doc, url: str) -> Dict[str, Any]:
+        """
+        Açılmış PDF belgesinden metin, meta veri ve yapı bilgisini çıkar
+        
+        Args:
+            doc: PyMuPDF belge nesnesi
+            url: PDF'nin URL'si
+        
+        Returns:
+            Dict[str, Any]: Çıkarılan içerik
+        """
+        # Sayfa metinleri listede toplanıp sonda bir kez birleştirilir (her sayfada kopyalama yapılmaz)
+        page_texts = []
+        structure = []
+        
+        # Meta bilgileri al
+        metadata = self._extract_metadata(doc)
+        
+        # İçindekiler tablosunu al
+        toc = doc.get_toc()
+        
+        # Her sayfanın içeriğini ve yapısını çıkar
+        for page_num, page in enumerate(doc):
+            # Sayfa metnini al
+            page_text = page.get_text()
+            page_texts.append(page_text)
+        
+            # Sayfa yapısı hakkında bilgi topla
+            structure.append({
+                'page_number': page_num + 1,
+                'text_length': len(page_text)
+            })
+        
+        # Her sayfadan sonra boş satır (önceki çıktı biçimiyle aynı)
+        full_text = ''.join(f"{page_text}\n\n" for page_text in page_texts)
+        
+        return {
+            'title': metadata.get('title', None),
+            'full_text': full_text,
+            'main_content': full_text,  # PDF'ler için ana içerik tüm metindir
+            'hospital_info': None,  # PDF'lerde hastane bilgisi belirtilmiyor
+            'links': [],  # PDF'lerde bağlantı çıkarmıyoruz
+            'url': url,
+            'metadata': metadata,
+            'toc': toc,
+            'structure': structure,
+            'content_type': 'application/pdf'
+        }
+        
+    @staticmethod
+    def _error_result(url: str, e: Exception) -> Dict[str, Any]:
+        """Hata durumunda döndürülecek boş içerik"""
+        return {
+            'title': None,
+            'full_text': None,
+            'main_content': None,
+            'hospital_info': None,
+            'links': [],
+            'url': url,
+            'error': str(e),
+            'content_type': 'application/pdf'
+        }
     
     @staticmethod
     def _extract_metadata(doc) -> dict:
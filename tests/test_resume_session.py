@@ -0,0 +1,104 @@
+"""
+Duraklatılıp devam ettirilen taramanın oturum kaydını test et
+
+Çalıştırma: python -m unittest discover -s tests
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+# Ayarlar içe aktarmada okunduğundan veritabanı ve log dosyası modüllerden önce belirlenir
+_TMP_DIR = tempfile.mkdtemp(prefix='crawler-test-')
+_DB_PATH = os.path.join(_TMP_DIR, 'test.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{_DB_PATH}'
+os.environ['LOG_FILE'] = os.path.join(_TMP_DIR, 'test.log')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web  # noqa: E402
+
+from crawler.crawler import WebCrawler  # noqa: E402
+from database.db_manager import DatabaseManager  # noqa: E402
+
+PORT = 8791
+BASE_URL = f'http://127.0.0.1:{PORT}/'
+
+
+def _page(title: str, links=()) -> str:
+    """Verilen bağlantıları içeren basit bir HTML sayfası oluştur"""
+    anchors = ''.join(f'<a href="{link}">{link}</a>' for link in links)
+    return f'<html><head><title>{title}</title></head><body><p>{title}</p>{anchors}</body></html>'
+
+
+def _session_row(session_id: int):
+    """Tarama oturumu kaydının (status, end_time) değerlerini doğrudan veritabanından oku"""
+    with sqlite3.connect(_DB_PATH) as conn:
+        return conn.execute(
+            'SELECT status, end_time FROM crawl_sessions WHERE id = ?', (session_id,)
+        ).fetchone()
+
+
+class ResumeSessionTest(unittest.IsolatedAsyncioTestCase):
+    """pause() -> resume() akışında oturum durumunun güncellenmesi"""
+
+    async def asyncSetUp(self):
+        self.crawler = None
+        self.paused = False
+        self.rows_during_resume = []
+
+        async def index(request):
+            return web.Response(text=_page('index', ['/p1', '/p2', '/p3']), content_type='text/html')
+
+        async def page(request):
+            name = request.match_info['name']
+            if name == 'p1' and not self.paused:
+                # İlk alt sayfada tarama duraklatılır (işçi bu isteği bitirip durur)
+                self.paused = True
+                await self.crawler.pause()
+            elif self.paused and not self.crawler.is_paused:
+                # Devam ettirilen taramada işçiler çalışırken oturum kaydını oku
+                self.rows_during_resume.append(_session_row(self.crawler.current_session_id))
+            return web.Response(text=_page(name), content_type='text/html')
+
+        app = web.Application()
+        app.router.add_get('/', index)
+        app.router.add_get('/{name}', page)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, '127.0.0.1', PORT).start()
+
+    async def asyncTearDown(self):
+        if self.crawler is not None:
+            await self.crawler.close()
+            await self.crawler.db_manager.engine.dispose()
+        await self.runner.cleanup()
+
+    async def test_resume_marks_session_running(self):
+        self.crawler = WebCrawler(BASE_URL, DatabaseManager(), concurrency=1)
+        # Hız sınırı testte beklemeye yol açmasın
+        self.crawler.rate_limiter.interval_ns = 0
+
+        await self.crawler.start()
+        session_id = self.crawler.current_session_id
+        self.assertTrue(self.crawler.is_paused)
+        status, end_time = _session_row(session_id)
+        self.assertEqual(status, 'paused')
+        self.assertIsNotNone(end_time)
+
+        await self.crawler.resume()
+
+        # Devam ettirilen taramada kalan sayfalar getirildi ve oturum çalışıyor görünüyordu
+        self.assertTrue(self.rows_during_resume)
+        for status, end_time in self.rows_during_resume:
+            self.assertEqual(status, 'running')
+            self.assertIsNone(end_time)
+
+        status, end_time = _session_row(session_id)
+        self.assertEqual(status, 'completed')
+        self.assertIsNotNone(end_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
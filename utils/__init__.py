@@ -4,5 +4,10 @@ Yardımcı modüller
 from utils.logger import setup_logger, LoggingTimer
 from utils.proxy_manager import ProxyManager
 from utils.user_agents import UserAgentManager
+from utils.url_bitset import URLBitSet
+from utils.bloom_filter import ScalableBloomFilter
+from utils.hashing import hash_url
+from utils.simhash import NearDuplicateIndex, simhash
 
-__all__ = ['setup_logger', 'LoggingTimer', 'ProxyManager', 'UserAgentManager']
+__all__ = ['setup_logger', 'LoggingTimer', 'ProxyManager', 'UserAgentManager', 'URLBitSet', 'ScalableBloomFilter', 'hash_url',
+           'NearDuplicateIndex', 'simhash']
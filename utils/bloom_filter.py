@@ -0,0 +1,134 @@
+"""
+Ziyaret edilen URL'ler için ölçeklenebilir Bloom filtresi
+"""
+import hashlib
+import math
+from collections import deque
+from typing import List, Tuple
+
+try:
+    import xxhash
+except ImportError:  # xxhash isteğe bağlıdır
+    xxhash = None
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _hash_pair(item: str) -> Tuple[int, int]:
+    """
+    Çift hash yöntemi için iki bağımsız 64 bitlik hash üret
+
+    Args:
+        item: Hash değeri alınacak metin
+
+    Returns:
+        Tuple[int, int]: (h1, h2); h2 her zaman tektir
+    """
+    data = item.encode()
+    if xxhash is not None:
+        digest = xxhash.xxh3_128_intdigest(data)
+    else:
+        digest = int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), 'little')
+    return digest & _MASK_64, (digest >> 64) | 1
+
+
+class BloomFilter:
+    """Sabit kapasiteli, bytearray tabanlı Bloom filtresi"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        BloomFilter sınıfını başlat
+
+        Args:
+            capacity: Hedeflenen öğe sayısı
+            error_rate: Kapasite dolduğunda kabul edilen yanlış pozitif oranı
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, math.ceil(-math.log2(error_rate)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, h1: int, h2: int):
+        num_bits = self.num_bits
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % num_bits
+
+    def add_hashes(self, h1: int, h2: int) -> None:
+        bits = self.bits
+        for position in self._positions(h1, h2):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains_hashes(self, h1: int, h2: int) -> bool:
+        bits = self.bits
+        for position in self._positions(h1, h2):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class ScalableBloomFilter:
+    """
+    Dolan filtrenin ardına daha büyük ve daha sıkı bir filtre ekleyerek büyüyen Bloom filtresi
+
+    Toplam yanlış pozitif oranı error_rate ile sınırlı kalır. Son eklenen URL'ler ayrıca
+    küçük bir tam kümede tutulur; sık tekrar eden URL'ler bit dizilerine inmeden yanıtlanır.
+    """
+
+    def __init__(self, initial_capacity: int = 1_000_000, error_rate: float = 1e-7,
+                 recent_size: int = 50_000):
+        """
+        ScalableBloomFilter sınıfını başlat
+
+        Args:
+            initial_capacity: İlk filtrenin kapasitesi (sonrakiler ikişer kat büyür)
+            error_rate: Hedeflenen toplam yanlış pozitif oranı
+            recent_size: Tam olarak tutulan son URL sayısı (0: devre dışı)
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.filters: List[BloomFilter] = []
+        self.recent_size = recent_size
+        self.recent = set()
+        self.recent_order = deque()
+
+    def _remember(self, item: str) -> None:
+        if not self.recent_size:
+            return
+        self.recent.add(item)
+        self.recent_order.append(item)
+        if len(self.recent_order) > self.recent_size:
+            self.recent.discard(self.recent_order.popleft())
+
+    def add(self, item: str) -> None:
+        """
+        Öğeyi filtreye ekle
+
+        Args:
+            item: Eklenecek öğe (normalleştirilmiş URL)
+        """
+        if item in self.recent:
+            return
+        h1, h2 = _hash_pair(item)
+        if any(f.contains_hashes(h1, h2) for f in self.filters):
+            return
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            # Her yeni filtre iki kat kapasiteli ve yarı hata oranlıdır (toplam oran <= error_rate)
+            level = len(self.filters)
+            self.filters.append(BloomFilter(
+                self.initial_capacity << level,
+                self.error_rate * 0.5 ** (level + 1)
+            ))
+        self.filters[-1].add_hashes(h1, h2)
+        self._remember(item)
+
+    def __contains__(self, item: str) -> bool:
+        if item in self.recent:
+            return True
+        h1, h2 = _hash_pair(item)
+        return any(f.contains_hashes(h1, h2) for f in self.filters)
+
+    def __len__(self) -> int:
+        return sum(f.count for f in self.filters)
@@ -0,0 +1,24 @@
+"""
+URL tekilleştirme için ortak hash fonksiyonu
+"""
+import hashlib
+
+# Veritabanındaki url_hash sütunlarının şeması (değişirse database.db_manager'a geçiş eklenmeli)
+URL_HASH_SCHEME = "blake2b-128"
+URL_HASH_SIZE = 16  # bayt
+
+
+def hash_url(url: str) -> bytes:
+    """
+    URL için 16 baytlık ham hash üret (yalnızca tekilleştirme için, kriptografik değil)
+
+    xxhash bilinçli olarak kullanılmaz: hash'ler diske yazıldığından sonuç isteğe bağlı
+    bir paketin kurulu olup olmamasına göre değişmemelidir.
+
+    Args:
+        url: Hash değeri alınacak URL
+
+    Returns:
+        bytes: URL'nin hash değeri
+    """
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=URL_HASH_SIZE).digest()
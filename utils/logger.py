@@ -1,44 +1,36 @@
 """
 Loglama sistemi için yardımcı fonksiyonlar
 """
+import atexit
 import logging
 import os
+import queue
 import time
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-from config.settings import LOG_LEVEL, LOG_FILE
+from config.settings import LOG_LEVEL, LOG_FILE, LOG_DEBUG_ENABLED
 
-def setup_logger(name, log_file=LOG_FILE, level=LOG_LEVEL):
+# Log dosyası başına bir kez oluşturulan, tüm logger'larca paylaşılan kuyruk handler'ı;
+# dosya ve konsola yazma işini arka plandaki QueueListener iş parçacığı yapar
+_handlers = {}
+_listeners = {}
+
+
+def _get_handlers(log_file):
     """
-    Özelleştirilmiş bir logger oluşturur
+    Verilen log dosyası için dosya ve konsol handler'larını bir kez oluşturur
     
     Args:
-        name: Logger adı
         log_file: Log dosyası yolu
-        level: Log seviyesi (INFO, DEBUG, vb.)
     
     Returns:
-        Logger: Yapılandırılmış logger nesnesi
+        tuple: (file_handler, console_handler)
     """
     # Log klasörünü oluştur
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir)
     
-    # Log seviyesini belirle
-    level_map = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARNING': logging.WARNING,
-        'ERROR': logging.ERROR,
-        'CRITICAL': logging.CRITICAL
-    }
-    log_level = level_map.get(level.upper(), logging.INFO)
-    
-    # Logger'ı yapılandır
-    logger = logging.getLogger(name)
-    logger.setLevel(log_level)
-    
     # Log dosyasına yazmak için handler
     file_handler = RotatingFileHandler(
         log_file, 
@@ -54,10 +46,81 @@ def setup_logger(name, log_file=LOG_FILE, level=LOG_LEVEL):
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
-    # Handler'ları ekle
+    return file_handler, console_handler
+
+
+def _get_queue_handler(log_file):
+    """
+    Verilen log dosyası için kuyruk handler'ını ve onu boşaltan dinleyiciyi bir kez oluşturur
+    
+    Log çağrısı yalnızca kuyruğa ekleme yapar; dosya yazma ve döndürme olay döngüsünü bekletmez.
+    
+    Args:
+        log_file: Log dosyası yolu
+    
+    Returns:
+        QueueHandler: Logger'lara eklenecek handler
+    """
+    handler = _handlers.get(log_file)
+    if handler is None:
+        log_queue = queue.SimpleQueue()
+        handler = _handlers[log_file] = QueueHandler(log_queue)
+        listener = _listeners[log_file] = QueueListener(log_queue, *_get_handlers(log_file))
+        listener.start()
+    return handler
+
+
+def _stop_listeners():
+    """Kuyrukta bekleyen kayıtları yazıp dinleyici iş parçacıklarını durdur"""
+    for listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
+
+
+def _restart_listeners_in_child():
+    """
+    fork ile oluşturulan alt süreçte (ProcessPoolExecutor işçileri) dinleyicileri yeniden başlat
+    
+    Dinleyici iş parçacıkları alt sürece kopyalanmaz; üst süreçten kalan kayıtlar iki kez
+    yazılmasın diye her handler yeni bir kuyruk alır.
+    """
+    for log_file, listener in _listeners.items():
+        log_queue = queue.SimpleQueue()
+        _handlers[log_file].queue = log_queue
+        listener = _listeners[log_file] = QueueListener(log_queue, *listener.handlers)
+        listener.start()
+
+
+atexit.register(_stop_listeners)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listeners_in_child)
+
+
+def setup_logger(name, log_file=LOG_FILE, level=LOG_LEVEL):
+    """
+    Özelleştirilmiş bir logger oluşturur
+    
+    Args:
+        name: Logger adı
+        log_file: Log dosyası yolu
+        level: Log seviyesi (logging.INFO gibi sayı ya da 'INFO' gibi ad)
+    
+    Returns:
+        Logger: Yapılandırılmış logger nesnesi
+    """
+    # Log seviyesini belirle
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    
+    # Logger'ı yapılandır
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    
+    # Kuyruk handler'ını ekle (aynı dosya için tek handler ve dinleyici paylaşılır)
     if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        logger.addHandler(_get_queue_handler(log_file))
     
     return logger
 
@@ -79,14 +142,15 @@ class LoggingTimer:
     
     def __enter__(self):
         """Context manager başlangıcı"""
-        self.start_time = time.time()
-        self.logger.debug(f"{self.operation_name} başladı")
+        self.start_time = time.monotonic()
+        if LOG_DEBUG_ENABLED:
+            self.logger.debug(f"{self.operation_name} başladı")
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager bitişi"""
-        duration = time.time() - self.start_time
+        duration = time.monotonic() - self.start_time
         if exc_type:
             self.logger.error(f"{self.operation_name} hata ile sonlandı: {exc_val}, Süre: {duration:.2f} saniye")
-        else:
+        elif LOG_DEBUG_ENABLED:
             self.logger.debug(f"{self.operation_name} tamamlandı, Süre: {duration:.2f} saniye")
\ No newline at end of file
@@ -4,7 +4,7 @@ Proxy yönetimi için yardımcı sınıflar ve fonksiyonlar
 import asyncio
 import logging
 import random
-from typing import List, Optional, Set, Dict
+from typing import Optional, Sequence, Set, Dict
 from urllib.parse import urlparse
 
 import aiohttp
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 class ProxyManager:
     """Proxy rotasyonu ve yönetimi için sınıf"""
     
-    def __init__(self, proxies: List[str] = None, rotation_limit: int = PROXY_ROTATION_LIMIT):
+    def __init__(self, proxies: Sequence[str] = None, rotation_limit: int = PROXY_ROTATION_LIMIT):
         """
         ProxyManager sınıfını başlat
         
@@ -25,12 +25,22 @@ class ProxyManager:
             proxies: Kullanılacak proxy listesi ("ip:port:username:password" formatında)
             rotation_limit: Kaç istekte bir proxy değişeceği
         """
-        self.proxies = proxies or PROXIES
+        self.proxies = tuple(proxies or PROXIES)
         self.rotation_limit = rotation_limit
         self.current_index = 0
         self.rotation_count = 0
         self.failed_proxies: Set[str] = set()
         self.working_proxies: Dict[str, int] = {}  # proxy: başarı sayısı
+        self._best_working: Optional[str] = None  # en çok başarılı proxy (None: yeniden hesaplanacak)
+        
+        # Proxy URL'leri bir kez oluşturulur (self.proxies ile aynı sırada; geçersiz girdiler None)
+        self._proxy_urls = tuple(self.format_proxy_url(proxy_string) for proxy_string in self.proxies)
+        self._proxy_strings: Dict[str, str] = {}  # proxy URL'si: ham proxy dizesi
+        for proxy_string, proxy_url in zip(self.proxies, self._proxy_urls):
+            if proxy_url is None:
+                self.failed_proxies.add(proxy_string)
+            else:
+                self._proxy_strings[proxy_url] = proxy_string
     
     async def check_proxy(self, session: ClientSession, proxy_url: str) -> bool:
         """
@@ -47,14 +57,41 @@ class ProxyManager:
             async with session.get('http://httpbin.org/ip', proxy=proxy_url, timeout=5) as response:
                 if response.status == 200:
                     # Çalışan proxy'lere başarı puanı ekle
-                    self.working_proxies[proxy_url] = self.working_proxies.get(proxy_url, 0) + 1
+                    self._record_success(proxy_url)
                     return True
         except Exception as e:
             logger.debug(f"Proxy kontrol hatası ({proxy_url}): {str(e)}")
             pass
         return False
     
-    async def format_proxy_url(self, proxy_string: str) -> Optional[str]:
+    def _record_success(self, proxy_url: str) -> None:
+        """
+        Proxy'nin başarı sayısını artır ve en iyi proxy önbelleğini güncelle
+        
+        Args:
+            proxy_url: Başarılı proxy URL'si
+        """
+        count = self.working_proxies.get(proxy_url, 0) + 1
+        self.working_proxies[proxy_url] = count
+        
+        best = self._best_working
+        if best is None or best == proxy_url:
+            return
+        best_count = self.working_proxies[best]
+        if count > best_count:
+            self._best_working = proxy_url
+        elif count == best_count:
+            # Eşitlikte sözlükte önce gelen kazanır; sırayı bilmediğimizden bir sonraki seçimde hesaplanır
+            self._best_working = None
+    
+    def _get_best_working(self) -> str:
+        """En çok başarılı proxy'yi döndür (eşitlikte ilk eklenen; sonuç önbelleğe alınır)"""
+        if self._best_working is None:
+            self._best_working = max(self.working_proxies, key=self.working_proxies.__getitem__)
+        return self._best_working
+    
+    @staticmethod
+    def format_proxy_url(proxy_string: str) -> Optional[str]:
         """
         Ham proxy dizesini URL formatına dönüştür
         
@@ -101,9 +138,7 @@ class ProxyManager:
         
         # Çalıştığı bilinen proxy'leri öncelikle kullan
         if self.working_proxies and random.random() < 0.8:  # %80 ihtimalle çalışan proxy kullan
-            working_proxies = sorted(self.working_proxies.items(), key=lambda x: x[1], reverse=True)
-            if working_proxies:
-                return working_proxies[0][0]
+            return self._get_best_working()
         
         # Başarısız olmayan bir sonraki proxy'yi bul
         attempts = 0
@@ -111,18 +146,14 @@ class ProxyManager:
         
         while attempts < max_attempts:
             proxy_string = self.proxies[self.current_index]
+            proxy_url = self._proxy_urls[self.current_index]
             self.current_index = (self.current_index + 1) % len(self.proxies)
             
+            # Geçersiz girdiler __init__ içinde başarısız olarak işaretlenmiştir
             if proxy_string in self.failed_proxies:
                 attempts += 1
                 continue
             
-            proxy_url = await self.format_proxy_url(proxy_string)
-            if not proxy_url:
-                self.failed_proxies.add(proxy_string)
-                attempts += 1
-                continue
-            
             # İlk kullanımda proxy'yi test et
             if session and proxy_url not in self.working_proxies:
                 if await self.check_proxy(session, proxy_url):
@@ -143,12 +174,12 @@ class ProxyManager:
         Args:
             proxy_url: Başarısız proxy URL'si
         """
-        for proxy_string in self.proxies:
-            if proxy_url.endswith(proxy_string.split(':')[0]):
-                self.failed_proxies.add(proxy_string)
-                if proxy_url in self.working_proxies:
-                    del self.working_proxies[proxy_url]
-                break
+        proxy_string = self._proxy_strings.get(proxy_url)
+        if proxy_string is None:
+            return
+        self.failed_proxies.add(proxy_string)
+        if self.working_proxies.pop(proxy_url, None) is not None and self._best_working == proxy_url:
+            self._best_working = None
     
     def get_proxy_stats(self) -> Dict:
         """
@@ -0,0 +1,134 @@
+"""
+Yakın kopya sayfaların tespiti için 64 bitlik SimHash parmak izleri
+"""
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Yalnızca harflerden oluşan kelimeler; rakamlar (tarih, sayaç, sayfa no.) parmak izine girmez
+_TOKEN_RE = re.compile(r'[^\W\d_]+')
+
+# Her hash bitinin ağırlığı büyük tamsayının ayrı bir 32 bitlik diliminde toplanır
+_LANE_BITS = 32
+_LANE_MASK = (1 << _LANE_BITS) - 1
+
+
+@lru_cache(maxsize=1 << 16)
+def _spread_token(token: str) -> int:
+    """
+    Kelimenin 64 bitlik hash'ini, her biti ayrı bir dilimin en düşük bitine gelecek şekilde yay
+
+    Böylece bir sayfadaki tüm kelimelerin bit ağırlıkları tek bir tamsayı toplamıyla hesaplanır.
+
+    Args:
+        token: Küçük harfe çevrilmiş kelime
+
+    Returns:
+        int: Yayılmış hash
+    """
+    digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+    spread = 0
+    for bit in range(64):
+        if digest >> bit & 1:
+            spread |= 1 << (bit * _LANE_BITS)
+    return spread
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Metnin 64 bitlik SimHash parmak izini hesapla (kelimeler tekrar sayısıyla ağırlıklandırılır)
+
+    Args:
+        text: Sayfa metni
+
+    Returns:
+        Optional[int]: Parmak izi; metinde kelime yoksa None
+    """
+    counts = Counter(_TOKEN_RE.findall(text.lower()))
+    if not counts:
+        return None
+
+    # i. dilim: i. biti 1 olan kelimelerin toplam ağırlığı
+    lanes = sum(count * _spread_token(token) for token, count in counts.items())
+    weight = sum(counts.values())
+
+    fingerprint = 0
+    for bit in range(64):
+        if 2 * ((lanes >> (bit * _LANE_BITS)) & _LANE_MASK) > weight:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """
+    Hamming uzaklığı max_distance veya daha az olan parmak izlerini bulan dizin
+
+    Parmak izi max_distance + 1 bloğa bölünür; en fazla max_distance bit farklı olan iki
+    parmak izinin en az bir bloğu aynıdır. Bu yüzden yalnızca bir bloğu eşleşen adaylar
+    karşılaştırılır, tüm parmak izleri taranmaz.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        """
+        NearDuplicateIndex sınıfını başlat
+
+        Args:
+            max_distance: Kopya sayılacak en büyük Hamming uzaklığı (0-63)
+        """
+        if not 0 <= max_distance < 64:
+            raise ValueError(f"max_distance 0 ile 63 arasında olmalı, alınan değer: {max_distance}")
+        self.max_distance = max_distance
+        block_count = max_distance + 1
+        width = 64 // block_count
+        # (kaydırma, maske) çiftleri; son blok kalan bitleri de alır
+        self._blocks = tuple(
+            (i * width, (1 << (width if i < block_count - 1 else 64 - i * width)) - 1)
+            for i in range(block_count)
+        )
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._blocks]
+        self.count = 0
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """
+        Parmak izine yeterince yakın kayıtlı bir parmak izi ara
+
+        Args:
+            fingerprint: 64 bitlik parmak izi
+
+        Returns:
+            Optional[int]: Bulunan parmak izi veya yoksa None
+        """
+        max_distance = self.max_distance
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            for candidate in table.get((fingerprint >> shift) & mask, ()):
+                if (candidate ^ fingerprint).bit_count() <= max_distance:
+                    return candidate
+        return None
+
+    def add(self, fingerprint: int) -> None:
+        """
+        Parmak izini dizine ekle
+
+        Args:
+            fingerprint: 64 bitlik parmak izi
+        """
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            table.setdefault((fingerprint >> shift) & mask, []).append(fingerprint)
+        self.count += 1
+
+    def add_if_new(self, fingerprint: int) -> bool:
+        """
+        Yakın bir kopyası yoksa parmak izini ekle
+
+        Args:
+            fingerprint: 64 bitlik parmak izi
+
+        Returns:
+            bool: Eklendiyse True, yakın kopya bulunduysa False
+        """
+        if self.find(fingerprint) is not None:
+            return False
+        self.add(fingerprint)
+        return True
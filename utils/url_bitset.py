@@ -0,0 +1,60 @@
+"""
+Ziyaret edilen URL'ler için sabit boyutlu bit kümesi
+"""
+import hashlib
+
+try:
+    import xxhash
+except ImportError:  # xxhash isteğe bağlıdır
+    xxhash = None
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    URL için 64 bitlik parmak izi üret (xxhash kuruluysa xxh3, değilse blake2b)
+
+    Args:
+        url: Parmak izi alınacak URL
+
+    Returns:
+        int: 64 bitlik tam sayı
+    """
+    data = url.encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class URLBitSet:
+    """
+    URL parmak izlerini 2**bits boyutlu bir bit dizisinde tutan küme
+
+    URL başına bellek maliyeti sabittir; karşılığında küçük bir yanlış pozitif
+    olasılığı (daha önce görülmemiş bir URL'nin görülmüş sayılması) kabul edilir.
+    """
+
+    def __init__(self, bits: int):
+        """
+        URLBitSet sınıfını başlat
+
+        Args:
+            bits: Bit dizisi boyutunun 2 tabanında üssü (örn. 28 -> 32 MB)
+        """
+        if bits < 3:
+            raise ValueError(f"bits en az 3 olmalı, alınan değer: {bits}")
+        self.mask = (1 << bits) - 1
+        self.bits = bytearray(1 << (bits - 3))
+
+    def add(self, url: str) -> None:
+        """
+        URL'yi kümeye ekle
+
+        Args:
+            url: Eklenecek URL
+        """
+        index = url_fingerprint(url) & self.mask
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, url: str) -> bool:
+        index = url_fingerprint(url) & self.mask
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
@@ -1,23 +1,43 @@
 """
 User-Agent yönetimi için yardımcı sınıflar ve fonksiyonlar
 """
+import itertools
 import random
-from typing import List
+from typing import Sequence
 
 from config.settings import USER_AGENTS
 
+# Her istekte aynı olan header'lar (User-Agent ve Referer get_headers içinde eklenir)
+_BASE_HEADERS = {
+    'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Cache-Control': 'max-age=0',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Pragma': 'no-cache'
+}
+
+
 class UserAgentManager:
     """User-Agent rotasyonu için sınıf"""
     
-    def __init__(self, user_agents: List[str] = None):
+    def __init__(self, user_agents: Sequence[str] = None):
         """
         UserAgentManager sınıfını başlat
         
         Args:
             user_agents: Kullanılacak User-Agent listesi
         """
-        self.user_agents = user_agents or USER_AGENTS
-        self.current_index = 0
+        self.user_agents = tuple(user_agents or USER_AGENTS)
+        
+        # Sıralı rotasyon için döngüsel iterator ve rastgele seçim fonksiyonu bir kez bağlanır
+        self._next_agent = itertools.cycle(self.user_agents).__next__
+        self._choice = random.Random().choice
     
     def get_random(self) -> str:
         """
@@ -26,7 +46,7 @@ class UserAgentManager:
         Returns:
             str: Rastgele User-Agent
         """
-        return random.choice(self.user_agents)
+        return self._choice(self.user_agents)
     
     def get_next(self) -> str:
         """
@@ -35,9 +55,7 @@ class UserAgentManager:
         Returns:
             str: Sıradaki User-Agent
         """
-        agent = self.user_agents[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.user_agents)
-        return agent
+        return self._next_agent()
     
     def get_headers(self, referer: str = None) -> dict:
         """
@@ -49,20 +67,8 @@ class UserAgentManager:
         Returns:
             dict: HTTP header'ları
         """
-        headers = {
-            'User-Agent': self.get_next(),
-            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Cache-Control': 'max-age=0',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Pragma': 'no-cache'
-        }
+        # Sabit header'lar modül düzeyinde bir kez oluşturulur; User-Agent ilk sırada kalır
+        headers = {'User-Agent': self.get_next(), **_BASE_HEADERS}
         
         if referer:
             headers['Referer'] = referer